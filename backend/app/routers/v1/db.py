@@ -73,13 +73,11 @@ def background_index_database(aoai_info, search_info, db_info):
             embedding=aoai_info.get("embedding_deployment")
         )
 
-    manifest = internal_indexer.fetch_and_describe_tables()
+    # reuse the metadata of unchanged tables from the previous run
+    previous_manifest = internal_indexer.load_json_manifest('tables_manifest.json')
+    manifest = internal_indexer.fetch_and_describe_tables(previous_manifest=previous_manifest)
     internal_indexer.generate_table_embeddings()
 
-    tables_dict = internal_indexer.export_json_manifest()
-    with open('tables_manifest.json', 'w') as f:
-        f.write(tables_dict)
-
     search_endpoint = search_info.get("endpoint")
     search_key = search_info.get("api_key")
     embedding_deployment = aoai_info.get("embedding_deployment")
@@ -99,6 +97,11 @@ def background_index_database(aoai_info, search_info, db_info):
     # write to AI Search
     internal_indexer.push_to_ai_search()
 
+    # saved after the push, so tables that failed to upload are pushed again on the next run
+    tables_dict = internal_indexer.export_json_manifest()
+    with open('tables_manifest.json', 'w') as f:
+        f.write(tables_dict)
+
     # may close db connection and the aoai connection here.
     
     # release the lock
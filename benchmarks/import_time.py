@@ -0,0 +1,53 @@
+"""
+Measures the cold import time of sqltoolkit entry points, each in a fresh interpreter.
+
+    python benchmarks/import_time.py
+
+Compare with the eager package by running it on an older checkout. For a per-module
+breakdown use `python -X importtime -c "import sqltoolkit"`.
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPEAT = 5
+
+STATEMENTS = [
+    "import sqltoolkit",
+    "from sqltoolkit import connectors",
+    "from sqltoolkit.connectors import create_connector",
+    "from sqltoolkit import DatabaseClient",
+    "from sqltoolkit import SQLQueryChecker",
+]
+
+HEAVY_MODULES = ['pandas', 'sqlglot', 'pyodbc', 'psycopg2', 'snowflake.connector', 'azure.identity', 'azure.search.documents']
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+try:
+    {statement}
+    error = ''
+except ImportError as e:
+    error = str(e)
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ','.join(loaded), error, sep='|')
+"""
+
+
+def measure(statement: str):
+    script = SCRIPT.format(statement=statement, heavy=HEAVY_MODULES)
+    timings = []
+    for _ in range(REPEAT):
+        output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        elapsed, loaded, error = output.strip().split('|', 2)
+        timings.append(float(elapsed))
+    return min(timings), loaded, error
+
+
+if __name__ == '__main__':
+    for statement in STATEMENTS:
+        elapsed, loaded, error = measure(statement)
+        print(f"{statement:<55} {elapsed * 1000:8.1f} ms  loaded: {loaded or '-'}{'  ImportError: ' + error if error else ''}")
@@ -0,0 +1,61 @@
+"""
+Compares the Snowflake Arrow fetch path of DatabaseClient with the row by row `pd.read_sql` path.
+Needs a Snowflake account, configured through environment variables:
+
+    SNOWFLAKE_USER=... SNOWFLAKE_PASSWORD=... SNOWFLAKE_ACCOUNT=... SNOWFLAKE_WAREHOUSE=... \
+    SNOWFLAKE_DATABASE=SNOWFLAKE_SAMPLE_DATA SNOWFLAKE_SCHEMA=TPCH_SF1 \
+    python benchmarks/snowflake_arrow_fetch.py
+
+The query defaults to 500k rows of TPCH_SF1.ORDERS and can be changed with BENCHMARK_QUERY.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqltoolkit.client import DatabaseClient
+from sqltoolkit.connectors import SnowflakeConnector
+
+QUERY = os.environ.get('BENCHMARK_QUERY', 'SELECT * FROM ORDERS LIMIT 500000')
+REPEAT = 3
+
+
+def best_of(function) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def stream(client: DatabaseClient) -> int:
+    return sum(batch.num_rows for batch in client.iter_query_arrow(QUERY))
+
+
+if __name__ == '__main__':
+    connector = SnowflakeConnector(
+        user=os.environ['SNOWFLAKE_USER'],
+        password=os.environ['SNOWFLAKE_PASSWORD'],
+        account=os.environ['SNOWFLAKE_ACCOUNT'],
+        warehouse=os.environ['SNOWFLAKE_WAREHOUSE'],
+        database=os.environ['SNOWFLAKE_DATABASE'],
+        schema=os.environ['SNOWFLAKE_SCHEMA'],
+        # keep the server-side result cache from hiding fetch time differences
+        session_parameters={'USE_CACHED_RESULT': False},
+    )
+    legacy_client = DatabaseClient(connector, arrow_fetch=False)
+    arrow_client = DatabaseClient(connector)
+    try:
+        rows = len(legacy_client._read_sql(QUERY))
+        legacy = best_of(lambda: legacy_client._read_sql(QUERY))
+        arrow = best_of(lambda: arrow_client._read_sql(QUERY))
+        streamed = best_of(lambda: stream(arrow_client))
+
+        print(f"rows: {rows:,}")
+        print(f"pd.read_sql:           {legacy:.3f}s")
+        print(f"arrow to pandas:       {arrow:.3f}s ({legacy / arrow:.1f}x faster)")
+        print(f"arrow batches stream:  {streamed:.3f}s ({legacy / streamed:.1f}x faster)")
+    finally:
+        legacy_client.close()
+        arrow_client.close()
@@ -1,5 +1,32 @@
-from .connectors import AzureSQLConnector, PostgreSQLConnector, OdbcConnector, SnowflakeConnector
-from .client import DatabaseClient
-from .entities import TableColumn, Table
-from .indexer import DatabaseIndexer
-from .compiler import SQLQueryChecker
+import importlib
+
+# public names and the submodule defining them, imported on first attribute access so that
+# `import sqltoolkit` stays cheap and only the drivers and SDKs actually used are loaded
+_LAZY_ATTRIBUTES = {
+    'AzureSQLConnector': 'connectors',
+    'PostgreSQLConnector': 'connectors',
+    'OdbcConnector': 'connectors',
+    'SnowflakeConnector': 'connectors',
+    'SQLiteConnector': 'connectors',
+    'create_connector': 'connectors',
+    'register_connector': 'connectors',
+    'DatabaseClient': 'client',
+    'TableColumn': 'entities',
+    'Table': 'entities',
+    'DatabaseIndexer': 'indexer',
+    'SQLQueryChecker': 'compiler',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
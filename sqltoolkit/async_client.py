@@ -0,0 +1,195 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from sqltoolkit import sql_queries
+from sqltoolkit.cache import make_cache_key
+from sqltoolkit.client import DatabaseClient, get_tools_manifest
+from sqltoolkit.explain import parse_plan, check_estimate
+
+try:
+    from psycopg_pool import AsyncConnectionPool
+except ImportError:
+    AsyncConnectionPool = None
+
+
+class AsyncDatabaseClient:
+    """
+    Asyncio counterpart of `DatabaseClient` for the FastAPI backend, exposing the same methods
+    as coroutines.
+
+    PostgreSQL connectors use a native psycopg 3 async connection pool when `psycopg` and
+    `psycopg_pool` are installed. Every other connector (and PostgreSQL without psycopg 3)
+    runs a pooled `DatabaseClient` on a bounded thread pool of `max_workers` threads, so
+    hundreds of concurrent requests queue on a few threads instead of one thread each.
+    Both paths return the same JSON as `DatabaseClient` and apply the same row cap, statement
+    timeout, cost gate and result cache.
+
+    Use it as an async context manager, or call `open()` and `close()` explicitly.
+    """
+    def __init__(self, connector, max_workers: int = 8, min_connections: int = 1, max_connections: int = 10,
+                 max_rows: int = None, statement_timeout: float = None, max_estimated_rows: float = None,
+                 max_estimated_cost: float = None, result_cache=None, native: bool = True):
+        self.connector = connector
+        self.dialect = sql_queries.get_sqlglot_dialect(connector.type)
+        self.max_rows = max_rows
+        self.statement_timeout = statement_timeout
+        self.max_estimated_rows = max_estimated_rows
+        self.max_estimated_cost = max_estimated_cost
+        self.result_cache = result_cache
+        self.native = native and connector.type == 'POSTGRESQL' and AsyncConnectionPool is not None
+
+        if self.native:
+            self._pool = AsyncConnectionPool(connector.connection_string, min_size=min_connections,
+                                             max_size=max_connections, open=False)
+            # same keys as DatabaseClient, so a cache can be shared with synchronous clients
+            self._connector_key = make_cache_key(type=connector.type, connection=connector.connection_string)
+        else:
+            self._client = DatabaseClient(connector, min_connections=min_connections,
+                                          max_connections=min(max_workers, max_connections),
+                                          max_rows=max_rows, statement_timeout=statement_timeout,
+                                          max_estimated_rows=max_estimated_rows, max_estimated_cost=max_estimated_cost,
+                                          result_cache=result_cache)
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sqltoolkit")
+
+    async def open(self) -> None:
+        if self.native:
+            await self._pool.open()
+
+    async def close(self) -> None:
+        if self.native:
+            await self._pool.close()
+        else:
+            self._executor.shutdown(wait=False)
+            self._client.close()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+
+    async def _fetch(self, query: str, timeout: float = None):
+        """Runs a query on the native pool and returns (column names, rows)."""
+        async with self._pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                if timeout:
+                    # SET LOCAL only lasts until the end of the transaction the pool commits on return
+                    await cursor.execute(f"SET LOCAL statement_timeout = {int(timeout * 1000)}")
+                await cursor.execute(query)
+                columns = [column.name for column in cursor.description]
+                rows = await cursor.fetchall()
+        return columns, rows
+
+    async def _fetch_frame(self, query: str, timeout: float = None) -> pd.DataFrame:
+        """Returns the result of a query as a frame converted like `DatabaseClient` does: decimals
+        as floats, dates and times as strings."""
+        columns, rows = await self._fetch(query, timeout)
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        return DatabaseClient.convert_datetime_columns_to_string(df, cache_key=(self._connector_key, query))
+
+    async def _fetch_records(self, query: str, timeout: float = None) -> list:
+        return (await self._fetch_frame(query, timeout)).to_dict(orient='records')
+
+    async def _fetch_json(self, query: str, timeout: float = None) -> str:
+        return json.dumps(await self._fetch_records(query, timeout))
+
+    async def _cached(self, kind: str, text: str, compute) -> str:
+        if self.result_cache is None:
+            return await compute()
+        key = make_cache_key(kind=kind, connector=self._connector_key, text=text)
+        result = await asyncio.to_thread(self.result_cache.get, key)
+        if result is None:
+            result = await compute()
+            await asyncio.to_thread(self.result_cache.set, key, result)
+        return result
+
+    async def list_database_tables(self) -> str:
+        if not self.native:
+            return await self._run(self._client.list_database_tables)
+        query = sql_queries.get_query(self.connector.type, 'list_database_tables')
+        return await self._cached('list_database_tables', '', lambda: self._fetch_json(query))
+
+    async def query(self, query: str, max_rows: int = None, timeout: float = None) -> str:
+        if not self.native:
+            return await self._run(self._client.query, query, max_rows=max_rows, timeout=timeout)
+        max_rows = self.max_rows if max_rows is None else max_rows
+        timeout = self.statement_timeout if timeout is None else timeout
+        if max_rows is not None:
+            query = DatabaseClient.limit_query(query, max_rows, self.dialect)
+
+        async def run():
+            if self.max_estimated_rows is not None or self.max_estimated_cost is not None:
+                estimate = await self.check_query_cost(query)
+                if not estimate['allowed']:
+                    raise ValueError(f"Query rejected before execution: {estimate['reason']}")
+            return await self._fetch_json(query, timeout)
+
+        if self.result_cache is None:
+            return await run()
+        return await self._cached('query', DatabaseClient.normalize_query(query, self.dialect), run)
+
+    async def explain(self, query: str) -> dict:
+        if not self.native:
+            return await self._run(self._client.explain, query)
+        _, rows = await self._fetch(sql_queries.get_query(self.connector.type, 'explain_query', query=query))
+        return parse_plan(self.connector.type, rows[0][0])
+
+    async def check_query_cost(self, query: str, max_estimated_rows: float = None, max_estimated_cost: float = None) -> dict:
+        if not self.native:
+            return await self._run(self._client.check_query_cost, query, max_estimated_rows=max_estimated_rows,
+                                   max_estimated_cost=max_estimated_cost)
+        max_estimated_rows = self.max_estimated_rows if max_estimated_rows is None else max_estimated_rows
+        max_estimated_cost = self.max_estimated_cost if max_estimated_cost is None else max_estimated_cost
+        return check_estimate(await self.explain(query), max_estimated_rows, max_estimated_cost)
+
+    async def get_table_schema(self, table_name: str) -> str:
+        if not self.native:
+            return await self._run(self._client.get_table_schema, table_name)
+        query = sql_queries.get_query(self.connector.type, 'get_table_schema', table_name=table_name)
+
+        async def run():
+            return json.dumps({'Columns': await self._fetch_records(query)})
+
+        return await self._cached('get_table_schema', table_name, run)
+
+    async def get_table_rows(self, table_name: str) -> str:
+        if not self.native:
+            return await self._run(self._client.get_table_rows, table_name)
+        query = sql_queries.get_query(self.connector.type, 'get_table_rows', table_name=table_name)
+
+        async def run():
+            return (await self._fetch_frame(query)).to_markdown()
+
+        return await self._cached('get_table_rows', table_name, run)
+
+    async def get_column_values(self, table_name: str, column_name: str, sample_percent: float = None) -> str:
+        if not self.native:
+            return await self._run(self._client.get_column_values, table_name, column_name, sample_percent=sample_percent)
+        query = sql_queries.get_query(self.connector.type, 'get_column_values', table_name=table_name,
+                                      column_name=column_name, sample_percent=sample_percent)
+        try:
+            return await self._fetch_json(query)
+        except Exception as e:
+            print(e)
+            return json.dumps([{column_name: None}])
+
+    def get_available_tools(self) -> dict:
+        return {
+            "list_database_tables": self.list_database_tables,
+            "query": self.query,
+            "get_table_schema": self.get_table_schema,
+            "get_table_rows": self.get_table_rows,
+            "get_column_values": self.get_column_values
+        }
+
+    def get_tools_manifest(self) -> list:
+        return get_tools_manifest()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_cache_key(**params) -> str:
+    """Returns a content hash of the given request parameters (deployment, messages, options...)."""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """
+    In-process key/value cache with an optional time to live, evicting the least recently
+    used entries once the total size of the stored values exceeds `max_size_bytes`.
+    """
+    def __init__(self, max_size_bytes: int = 64 * 1024 * 1024, ttl: float = None):
+        self.max_size_bytes = max_size_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str, ttl: float = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_size_bytes:
+                return
+            self._entries[key] = (value, size, time.time() + ttl if ttl is not None else None)
+            self._size += size
+            while self._size > self.max_size_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "size_bytes": self._size}
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache stored in a single SQLite file.
+
+    Entries expire after `ttl` seconds when set, and are evicted least recently used
+    first once the total size of the stored values exceeds `max_size_bytes`. Any object
+    exposing `get(key)` and `set(key, value)` can be used in its place.
+    """
+    def __init__(self, path: str = ".sqltoolkit_cache/llm_cache.sqlite", max_size_bytes: int = 512 * 1024 * 1024,
+                 ttl: float = None):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL, expires_at REAL)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache)")]
+        if "expires_at" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN expires_at REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, last_access, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now + ttl if ttl is not None else None)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size_bytes": size}
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY last_access").fetchall():
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+
+
+def cached_chat_completion(aoai_client, aoai_deployment: str, messages: list, cache=None, **params) -> str:
+    """
+    Returns the content of a chat completion, replaying it from `cache` when the same
+    deployment, messages and parameters were already sent.
+    """
+    key = None
+    if cache is not None:
+        key = make_cache_key(model=aoai_deployment, messages=messages, **params)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = aoai_client.chat.completions.create(
+            model=aoai_deployment,
+            messages=messages,
+            **params)
+    content = response.choices[0].message.content
+
+    if cache is not None and content is not None:
+        cache.set(key, content)
+    return content
@@ -2,53 +2,614 @@ import json
 import pandas as pd
 import warnings
 from sqltoolkit import sql_queries
+from sqltoolkit.explain import PLAN_PARSERS, parse_plan, check_estimate
+from sqltoolkit.pool import ConnectionPool
+from sqltoolkit.cache import make_cache_key
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import ParseError
+import math
+import re
+from contextlib import contextmanager
 import datetime
+import time
+import uuid
+from typing import Iterator, List, IO
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 warnings.filterwarnings('ignore')
+
+# number of non-null values inspected to detect date/time objects in an object column
+DATETIME_SAMPLE_SIZE = 100
+# datetime column positions per cache key (client and query text) and result shape, reused for repeated queries
+DATETIME_CACHE_SIZE = 1024
+_DATETIME_COLUMNS_CACHE = {}
+# database types whose sample values are converted back from text by `get_table_column_values`
+NUMERIC_TYPES = {'int', 'integer', 'bigint', 'smallint', 'tinyint', 'mediumint', 'int2', 'int4', 'int8', 'serial',
+                 'bigserial', 'numeric', 'decimal', 'number', 'float', 'float4', 'float8', 'real', 'double',
+                 'double precision', 'money', 'smallmoney'}
+BOOLEAN_TYPES = {'bool', 'boolean', 'bit'}
+TEMPORAL_TYPES = {'date', 'datetime', 'datetime2', 'smalldatetime', 'datetimeoffset'}
   
 class DatabaseClient:  
-    def __init__(self, connector):  
+    def __init__(self, connector, min_connections: int = 1, max_connections: int = 5, idle_timeout: float = 300.0,
+                 health_check_interval: float = 30.0, checkout_timeout: float = None, result_cache=None,
+                 max_rows: int = None, statement_timeout: float = None, max_estimated_rows: float = None,
+                 max_estimated_cost: float = None, server_side_cursors: bool = True, itersize: int = 2000,
+                 arrow_fetch: bool = True):  
         self.connector = connector  
-        self.connection = self.connector.get_conn()
+        self.pool = ConnectionPool(connector,
+                                   min_size=min_connections,
+                                   max_size=max_connections,
+                                   idle_timeout=idle_timeout,
+                                   health_check_interval=health_check_interval,
+                                   checkout_timeout=checkout_timeout)
+        # optional MemoryCache / SQLiteCache (or any object with get/set) for query and metadata results
+        self.result_cache = result_cache
+        # default guards applied by `query` to generated SQL, None disables them
+        self.max_rows = max_rows
+        self.statement_timeout = statement_timeout
+        # queries whose EXPLAIN estimate exceeds these thresholds are rejected before running
+        if (max_estimated_rows is not None or max_estimated_cost is not None) and connector.type not in PLAN_PARSERS:
+            raise ValueError(f"max_estimated_rows and max_estimated_cost are not supported for {connector.type} connections, "
+                             f"query cost estimates are only available for {', '.join(PLAN_PARSERS)}.")
+        self.max_estimated_rows = max_estimated_rows
+        self.max_estimated_cost = max_estimated_cost
+        # PostgreSQL results are streamed through named server-side cursors, `itersize` rows at a time
+        self.server_side_cursors = server_side_cursors
+        self.itersize = itersize
+        # Snowflake results are fetched as Arrow batches (`fetch_arrow_batches`) when pyarrow is installed
+        self.arrow_fetch = arrow_fetch
+        self.dialect = sql_queries.get_sqlglot_dialect(connector.type)
+        self._connector_key = make_cache_key(
+            type=connector.type,
+            connection=getattr(connector, 'connection_string', None) or getattr(connector, 'connection_params', None)
+        )
+
+    def _read_sql(self, query: str, timeout: float = None) -> pd.DataFrame:
+        if self._use_arrow_fetch():
+            return self._arrow_to_pandas(self.query_arrow(query, timeout=timeout))
+        if self._use_server_side_cursor(query):
+            # build the frame from `itersize` batches instead of a fully buffered client-side cursor
+            batches = self._iter_cursor(query, batch_size=None, timeout=timeout)
+            columns = next(batches)
+            # coerce_float converts decimals like `pd.read_sql` does, so NUMERIC values stay JSON serializable
+            return pd.DataFrame.from_records([row for rows in batches for row in rows], columns=columns, coerce_float=True)
+        with self.pool.connection() as connection, self._statement_timeout(connection, timeout):
+            return pd.read_sql(query, connection)
+
+    @contextmanager
+    def _statement_timeout(self, connection, timeout: float = None):
+        """
+        Applies a server-side timeout to the statements run on `connection` inside the block,
+        so the engine cancels a query that runs too long:
+          - PostgreSQL: `SET statement_timeout`, reverted by rolling back the transaction
+          - Snowflake: `ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS`
+          - Azure SQL / ODBC: the pyodbc connection query timeout
+          - SQLite: a progress handler interrupting the statement after the deadline
+        """
+        if not timeout:
+            yield
+            return
+
+        connector_type = self.connector.type
+        if connector_type == 'POSTGRESQL':
+            cursor = connection.cursor()
+            cursor.execute(f"SET statement_timeout = {int(timeout * 1000)}")
+            cursor.close()
+            try:
+                yield
+            finally:
+                connection.rollback()
+        elif connector_type == 'SNOWFLAKE':
+            cursor = connection.cursor()
+            cursor.execute(f"ALTER SESSION SET STATEMENT_TIMEOUT_IN_SECONDS = {math.ceil(timeout)}")
+            try:
+                yield
+            finally:
+                cursor.execute("ALTER SESSION UNSET STATEMENT_TIMEOUT_IN_SECONDS")
+                cursor.close()
+        elif connector_type in ('AZURE_SQL', 'ODBC'):
+            previous = connection.timeout
+            connection.timeout = math.ceil(timeout)
+            try:
+                yield
+            finally:
+                connection.timeout = previous
+        elif connector_type == 'SQLITE':
+            deadline = time.monotonic() + timeout
+            connection.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+            try:
+                yield
+            finally:
+                connection.set_progress_handler(None, 0)
+        else:
+            print(f"Statement timeouts are not supported for {connector_type}, running without timeout.")
+            yield
+
+    @staticmethod
+    def limit_query(query: str, max_rows: int, dialect: str = None) -> str:
+        """
+        Rewrites a SELECT query so it returns at most `max_rows` rows, using the dialect's
+        syntax (TOP on SQL Server, LIMIT or FETCH elsewhere). A smaller existing limit is kept.
+        PERCENT and WITH TIES limits do not bound the row count: those queries are wrapped in
+        a capped subquery. Raises ValueError if the query cannot be parsed or is not a single
+        SELECT query.
+        """
+        try:
+            expression = sqlglot.parse_one(query, read=dialect)
+        except ParseError as e:
+            raise ValueError(f"Could not parse query to enforce a row limit: {e}")
+        if not isinstance(expression, exp.Query):
+            raise ValueError("Row limits can only be enforced on SELECT queries.")
+
+        current = expression.args.get('limit')
+        if isinstance(current, exp.Limit):
+            count = current.args.get('expression')
+        elif isinstance(current, exp.Fetch):
+            count = current.args.get('count')
+        else:
+            count = None
+        options = current.args.get('limit_options') if current is not None else None
+        if options is not None and (options.args.get('percent') or options.args.get('with_ties')):
+            return exp.select('*').from_(expression.subquery('_limited')).limit(max_rows).sql(dialect=dialect)
+        if isinstance(count, exp.Literal) and count.is_int and int(count.this) <= max_rows:
+            return query
+        return expression.limit(max_rows).sql(dialect=dialect)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    @staticmethod
+    def normalize_query(query: str, dialect: str = None) -> str:
+        """Returns a canonical form of a query (sqlglot generated SQL with normalized identifiers),
+        so that queries differing only in whitespace or casing share a cache entry. Queries sqlglot
+        cannot parse are keyed on their text, as whitespace inside literals matters."""
+        try:
+            expressions = sqlglot.parse(query, read=dialect)
+            return ";\n".join(expression.sql(dialect=dialect, normalize=True) for expression in expressions if expression is not None)
+        except Exception:
+            return query.strip()
+
+    def _cached(self, kind: str, text: str, compute) -> str:
+        if self.result_cache is None:
+            return compute()
+        key = make_cache_key(kind=kind, connector=self._connector_key, text=text)
+        result = self.result_cache.get(key)
+        if result is None:
+            result = compute()
+            self.result_cache.set(key, result)
+        return result
+
+    def cache_stats(self) -> dict:
+        """Returns the hit/miss counters of the result cache, or None if caching is disabled."""
+        return self.result_cache.stats() if self.result_cache is not None else None
   
     @staticmethod  
-    def convert_datetime_columns_to_string(df: pd.DataFrame) -> pd.DataFrame:  
-        for column in df.columns:  
-            if pd.api.types.is_datetime64_any_dtype(df[column]) or any(isinstance(x, (datetime.date, datetime.time)) for x in df[column] if x is not None):  
-                df[column] = df[column].astype(str)  
+    def _datetime_columns(df: pd.DataFrame, sample_size: int = DATETIME_SAMPLE_SIZE, cache_key=None) -> list:
+        """Returns the columns holding dates or times. Only datetime64 and object columns can,
+        and object columns are decided from a bounded sample of their non-null values.
+        With `cache_key` (the client and query text) the decision is cached per key and result
+        shape: the same column name can hold text in one query and dates in another. Object
+        columns with no non-null value stay undecided and are checked again on the next hit."""
+        shape = (cache_key, tuple((column, str(dtype)) for column, dtype in df.dtypes.items()))
+        cached = _DATETIME_COLUMNS_CACHE.get(shape) if cache_key is not None else None
+        if cached is None:
+            columns, candidates = [], range(len(df.columns))
+        elif not cached[1]:
+            return cached[0]
+        else:
+            columns, candidates = list(cached[0]), cached[1]
+
+        undecided = []
+        for i in candidates:
+            dtype = df.dtypes.iloc[i]
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                columns.append(i)
+            elif pd.api.types.is_object_dtype(dtype):
+                sample = df.iloc[:, i].dropna().head(sample_size)
+                if sample.empty:
+                    undecided.append(i)
+                elif any(isinstance(x, (datetime.date, datetime.time)) for x in sample):
+                    columns.append(i)
+        columns.sort()
+
+        if cache_key is None:
+            return columns
+        if cached is None and len(_DATETIME_COLUMNS_CACHE) >= DATETIME_CACHE_SIZE:
+            _DATETIME_COLUMNS_CACHE.clear()
+        _DATETIME_COLUMNS_CACHE[shape] = (columns, tuple(undecided))
+        return columns
+
+    @staticmethod  
+    def convert_datetime_columns_to_string(df: pd.DataFrame, cache_key=None) -> pd.DataFrame:  
+        """Converts date, time and datetime columns to strings with a vectorized cast.
+        With `cache_key`, the columns to convert are cached per key and result shape (column
+        names and dtypes)."""
+        for i in DatabaseClient._datetime_columns(df, cache_key=cache_key):  
+            df.isetitem(i, df.iloc[:, i].astype(str))
         return df  
   
     def list_database_tables(self) -> str:
+        return self._cached('list_database_tables', '', self._list_database_tables)
+
+    def _list_database_tables(self) -> str:
         query = sql_queries.get_query(self.connector.type, 'list_database_tables')
-        df = pd.read_sql(query, self.connection)  
+        df = self._read_sql(query)  
         return json.dumps(df.to_dict(orient='records'))  
   
-    def query(self, query: str) -> str:  
-        df = pd.read_sql(query, self.connection)  
-        df = self.convert_datetime_columns_to_string(df)  
+    def query(self, query: str, max_rows: int = None, timeout: float = None) -> str:  
+        """
+        Runs a query and returns its records as a JSON string.
+
+        `max_rows` (default `self.max_rows`) injects a row cap into the query AST and
+        `timeout` (default `self.statement_timeout`, in seconds) sets a server-side
+        statement timeout, so generated SQL cannot scan a whole warehouse.
+        """
+        max_rows = self.max_rows if max_rows is None else max_rows
+        timeout = self.statement_timeout if timeout is None else timeout
+        if max_rows is not None:
+            query = self.limit_query(query, max_rows, self.dialect)
+
+        def run():
+            if self.max_estimated_rows is not None or self.max_estimated_cost is not None:
+                estimate = self.check_query_cost(query)
+                if not estimate['allowed']:
+                    raise ValueError(f"Query rejected before execution: {estimate['reason']}")
+            return self._query(query, timeout)
+
+        if self.result_cache is None:
+            return run()
+        return self._cached('query', self.normalize_query(query, self.dialect), run)
+
+    def explain(self, query: str) -> dict:
+        """
+        Returns the engine's estimate for a query without running it, as a dictionary with
+        `estimated_rows` and `estimated_cost` (None when the engine does not provide one).
+        Uses EXPLAIN on PostgreSQL and Snowflake and SHOWPLAN_XML on SQL Server.
+        """
+        if self.connector.type not in PLAN_PARSERS:
+            raise ValueError(f"Query cost estimates are not supported for {self.connector.type} connections, "
+                             f"only for {', '.join(PLAN_PARSERS)}.")
+        explain_query = sql_queries.get_query(self.connector.type, 'explain_query', query=query)
+        try:
+            enable = sql_queries.get_query(self.connector.type, 'explain_enable')
+            disable = sql_queries.get_query(self.connector.type, 'explain_disable')
+        except ValueError:
+            enable = disable = None
+
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                if enable:
+                    cursor.execute(enable)
+                try:
+                    cursor.execute(explain_query)
+                    plan = cursor.fetchone()[0]
+                finally:
+                    if disable:
+                        cursor.execute(disable)
+            finally:
+                cursor.close()
+        return parse_plan(self.connector.type, plan)
+
+    def check_query_cost(self, query: str, max_estimated_rows: float = None, max_estimated_cost: float = None) -> dict:
+        """
+        Returns the `explain` estimate of a query with `allowed` set to False and a `reason`
+        when it exceeds the thresholds (defaulting to the client's). The result can be fed
+        back to the model so it rewrites the query.
+        """
+        max_estimated_rows = self.max_estimated_rows if max_estimated_rows is None else max_estimated_rows
+        max_estimated_cost = self.max_estimated_cost if max_estimated_cost is None else max_estimated_cost
+        return check_estimate(self.explain(query), max_estimated_rows, max_estimated_cost)
+
+    def _query(self, query: str, timeout: float = None) -> str:
+        if self._use_arrow_fetch():
+            return self.arrow_to_json(self.query_arrow(query, timeout=timeout))
+        if pa is None:
+            df = self._read_sql(query, timeout)
+        else:
+            # the rows are fetched once, then converted to Arrow or to pandas if Arrow cannot type them
+            batches = self._iter_cursor(query, 10000, timeout)
+            try:
+                columns = next(batches)
+                rows = list(batches)
+            finally:
+                batches.close()
+            try:
+                return self.arrow_to_json(self._rows_to_table(rows, columns))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # e.g. a column mixing text and numbers, which Arrow cannot type but pandas keeps as objects
+                df = pd.DataFrame.from_records([row for batch in rows for row in batch], columns=columns, coerce_float=True)
+        df = self.convert_datetime_columns_to_string(df, cache_key=(self._connector_key, query))  
         return json.dumps(df.to_dict(orient='records'))  
+
+    @staticmethod
+    def _rows_to_record_batch(rows: list, columns: list) -> "pa.RecordBatch":
+        return pa.RecordBatch.from_arrays([pa.array(values) for values in zip(*rows)], names=columns)
+
+    @staticmethod
+    def _concat_arrow_tables(tables: list, columns: list) -> "pa.Table":
+        if not tables:
+            return pa.table({column: pa.array([], type=pa.null()) for column in columns})
+        # batches infer their own types (a column that is all NULL in the first batch, ints then
+        # floats, decimals of different precision), widened to a common type
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def _rows_to_table(self, batches: list, columns: list) -> "pa.Table":
+        """Converts batches of row tuples to a pyarrow Table, one record batch per fetched batch."""
+        return self._concat_arrow_tables([pa.Table.from_batches([self._rows_to_record_batch(rows, columns)]) for rows in batches],
+                                         columns)
+
+    def _use_arrow_fetch(self) -> bool:
+        return self.arrow_fetch and pa is not None and self.connector.type == 'SNOWFLAKE'
+
+    def _iter_arrow_tables(self, query: str, batch_size: int = 10000, timeout: float = None):
+        """
+        Yields the column names, then the result of a query as pyarrow Tables. Snowflake
+        returns its result chunks as Arrow natively (`fetch_arrow_batches`), other engines
+        are read with `fetchmany` and converted column by column.
+        """
+        if not self._use_arrow_fetch():
+            batches = self._iter_cursor(query, batch_size, timeout)
+            try:
+                columns = next(batches)
+                yield columns
+                for rows in batches:
+                    yield pa.Table.from_batches([self._rows_to_record_batch(rows, columns)])
+            finally:
+                batches.close()
+            return
+
+        with self.pool.connection() as connection, self._statement_timeout(connection, timeout):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                yield [column[0] for column in cursor.description]
+                # yields nothing for an empty result
+                yield from cursor.fetch_arrow_batches()
+            finally:
+                cursor.close()
+
+    def iter_query_arrow(self, query: str, batch_size: int = 10000, timeout: float = None) -> Iterator["pa.RecordBatch"]:
+        """Streams the result of a query as Arrow record batches, holding one result chunk in memory at a time."""
+        if pa is None:
+            raise ImportError("pyarrow is required for the Arrow result path, install it with `pip install pyarrow`.")
+        tables = self._iter_arrow_tables(query, batch_size, timeout)
+        try:
+            next(tables)
+            for table in tables:
+                yield from table.to_batches()
+        finally:
+            tables.close()
+
+    def query_arrow(self, query: str, batch_size: int = 10000, timeout: float = None) -> "pa.Table":
+        """Returns the result of a query as a pyarrow Table."""
+        if pa is None:
+            raise ImportError("pyarrow is required for the Arrow result path, install it with `pip install pyarrow`.")
+        chunks = self._iter_arrow_tables(query, batch_size, timeout)
+        try:
+            columns = next(chunks)
+            tables = list(chunks)
+        finally:
+            chunks.close()
+        return self._concat_arrow_tables(tables, columns)
+
+    @staticmethod
+    def _arrow_to_pandas(table: "pa.Table") -> pd.DataFrame:
+        """Converts a pyarrow Table to pandas, with decimals as floats so the frame stays JSON serializable."""
+        columns = [pc.cast(column, pa.float64()) if pa.types.is_decimal(field.type) else column
+                   for field, column in zip(table.schema, table.columns)]
+        return pa.table(columns, names=table.column_names).to_pandas()
+
+    @staticmethod
+    def arrow_to_json(table: "pa.Table") -> str:
+        """
+        Serializes a pyarrow Table to a JSON list of records. Temporal columns are formatted
+        as strings and decimals as floats, matching the output of the pandas path, and orjson
+        is used when installed.
+        """
+        columns = []
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type) or pa.types.is_time(field.type):
+                # formatted by pandas, as the pandas path does: zero fractions dropped, UTC offsets kept
+                column = pa.array(column.to_pandas().astype(str), type=pa.string(), from_pandas=True)
+            elif pa.types.is_decimal(field.type):
+                column = pc.cast(column, pa.float64())
+            columns.append(column)
+        records = pa.table(columns, names=table.column_names).to_pylist()
+        if orjson is not None:
+            return orjson.dumps(records, default=str).decode("utf-8")
+        return json.dumps(records, default=str)
   
+    def _iter_cursor(self, query: str, batch_size: int = 1000, timeout: float = None):
+        """Yields the column names, then batches of row tuples fetched with `fetchmany`.
+        The connection is held until the generator is exhausted or closed."""
+        with self.pool.connection() as connection, self._statement_timeout(connection, timeout):
+            if self._use_server_side_cursor(query):
+                cursor = connection.cursor(name=f"sqltoolkit_{uuid.uuid4().hex}")
+                cursor.itersize = self.itersize
+                batch_size = batch_size or self.itersize
+            else:
+                cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                # named cursors only describe their columns after the first fetch
+                rows = cursor.fetchmany(batch_size)
+                yield [column[0] for column in cursor.description]
+                while rows:
+                    yield rows
+                    rows = cursor.fetchmany(batch_size)
+            finally:
+                cursor.close()
+
+    def _use_server_side_cursor(self, query: str) -> bool:
+        """Named cursors only exist on PostgreSQL and can only wrap queries returning rows (SELECT, WITH, VALUES...)."""
+        if not self.server_side_cursors or self.connector.type != 'POSTGRESQL':
+            return False
+        try:
+            return isinstance(sqlglot.parse_one(query, read='postgres'), exp.Query)
+        except ParseError:
+            return False
+
+    def iter_query(self, query: str, batch_size: int = 1000, max_rows: int = None) -> Iterator[List[dict]]:
+        """
+        Streams the result of a query as batches of up to `batch_size` records, fetched
+        from the cursor with `fetchmany` so only one batch is held in memory at a time.
+        Stops after `max_rows` rows when set.
+        """
+        batches = self._iter_cursor(query, batch_size)
+        try:
+            columns = next(batches)
+            sent = 0
+            for rows in batches:
+                if max_rows is not None:
+                    rows = rows[:max_rows - sent]
+                sent += len(rows)
+                if rows:
+                    yield [dict(zip(columns, row)) for row in rows]
+                if max_rows is not None and sent >= max_rows:
+                    break
+        finally:
+            batches.close()
+
+    def iter_query_ndjson(self, query: str, batch_size: int = 1000, max_rows: int = None, max_bytes: int = None,
+                          stats: dict = None) -> Iterator[str]:
+        """
+        Streams the result of a query as NDJSON lines (one JSON record per line), with hard
+        caps on the number of rows and encoded bytes. Dates and other non JSON types are
+        written as strings. If `stats` is given it is filled with the number of rows and
+        bytes sent and whether the result was truncated by a cap.
+        """
+        stats = {} if stats is None else stats
+        stats.update(rows=0, bytes=0, truncated=False)
+        batches = self._iter_cursor(query, batch_size)
+        try:
+            columns = next(batches)
+            for rows in batches:
+                for row in rows:
+                    line = json.dumps(dict(zip(columns, row)), default=str) + "\n"
+                    size = len(line.encode("utf-8"))
+                    if (max_rows is not None and stats['rows'] >= max_rows) or \
+                            (max_bytes is not None and stats['bytes'] + size > max_bytes):
+                        stats['truncated'] = True
+                        return
+                    stats['rows'] += 1
+                    stats['bytes'] += size
+                    yield line
+        finally:
+            batches.close()
+
+    def write_query_ndjson(self, query: str, file: IO[str], batch_size: int = 1000, max_rows: int = None,
+                           max_bytes: int = None) -> dict:
+        """Writes the result of a query to a text file object as NDJSON and returns the stats of `iter_query_ndjson`."""
+        stats = {}
+        for line in self.iter_query_ndjson(query, batch_size=batch_size, max_rows=max_rows, max_bytes=max_bytes, stats=stats):
+            file.write(line)
+        return stats
+
     def get_table_schema(self, table_name: str) -> str:  
+        return self._cached('get_table_schema', table_name, lambda: self._get_table_schema(table_name))
+
+    def _get_table_schema(self, table_name: str) -> str:
         query = sql_queries.get_query(self.connector.type, 'get_table_schema', table_name=table_name)
-        df = pd.read_sql(query, self.connection)  
+        df = self._read_sql(query)  
         return json.dumps({'Columns':df.to_dict(orient='records')})  
   
+    def get_all_table_schemas(self, table_names: list = None) -> str:
+        """Returns the columns of every selected table (all tables if None) in one query, keyed by table name."""
+        query = sql_queries.get_query(self.connector.type, 'get_all_table_schemas', table_names=table_names)
+        df = self._read_sql(query)
+        schemas = {}
+        for record in df.to_dict(orient='records'):
+            schemas.setdefault(record.pop('table_name'), []).append(record)
+        return json.dumps({table_name: {'Columns': columns} for table_name, columns in schemas.items()})
+
     def get_table_rows(self, table_name: str) -> str:  
+        return self._cached('get_table_rows', table_name, lambda: self._get_table_rows(table_name))
+
+    def _get_table_rows(self, table_name: str) -> str:
         query = sql_queries.get_query(self.connector.type, 'get_table_rows', table_name=table_name) 
-        df = pd.read_sql(query, self.connection)  
-        df = self.convert_datetime_columns_to_string(df)  
+        df = self._read_sql(query)  
+        df = self.convert_datetime_columns_to_string(df, cache_key=(self._connector_key, query))  
         return df.to_markdown()  
   
-    def get_column_values(self, table_name: str, column_name: str) -> str:  
-        query = sql_queries.get_query(self.connector.type, 'get_column_values', table_name=table_name, column_name=column_name)
+    def get_table_row_count(self, table_name: str) -> int:
+        """Returns the estimated row count of a table from the engine statistics, or None if unavailable."""
+        query = sql_queries.get_query(self.connector.type, 'get_table_row_count', table_name=table_name)
+        try:
+            df = self._read_sql(query)
+            df.columns = [column.lower() for column in df.columns]
+            row_count = df['row_count'].iloc[0] if len(df) else None
+            return None if row_count is None or pd.isna(row_count) else int(row_count)
+        except Exception as e:
+            print(e)
+            return None
+
+    def get_sample_percent(self, table_name: str, row_budget: int) -> float:
+        """Returns the percentage of the table to sample so that about `row_budget` rows are read,
+        or None when the table is small enough (or its size unknown) to be read in full."""
+        row_count = self.get_table_row_count(table_name)
+        if not row_budget or not row_count or row_count <= row_budget:
+            return None
+        return max(row_budget / row_count * 100, 0.000001)
+
+    def get_column_values(self, table_name: str, column_name: str, sample_percent: float = None) -> str:  
+        query = sql_queries.get_query(self.connector.type, 'get_column_values', table_name=table_name, column_name=column_name,
+                                      sample_percent=sample_percent)
         try:  
-            df = pd.read_sql(query, self.connection)  
-            df = self.convert_datetime_columns_to_string(df)  
+            df = self._read_sql(query)  
+            df = self.convert_datetime_columns_to_string(df, cache_key=(self._connector_key, query))  
             return json.dumps(df.to_dict(orient='records'))
         except Exception as e:
             print(e)
             return json.dumps([{column_name:None}])
     
+    def get_table_column_values(self, table_name: str, column_names: list, sample_percent: float = None,
+                                column_types: dict = None) -> str:
+        """Returns up to 10 distinct sample values for every column of a table in a single query,
+        keyed by column name. The query returns them as text; with `column_types` (column name
+        to database type) numbers and booleans are converted back to native values, as the
+        per-column path returns them. Errors are raised so the caller can fall back to `get_column_values`."""
+        column_types = column_types or {}
+        query = sql_queries.get_query(self.connector.type, 'get_table_column_values', table_name=table_name, column_names=column_names,
+                                      sample_percent=sample_percent, column_types=column_types)
+        df = self._read_sql(query)
+        df.columns = [column.lower() for column in df.columns]
+        df = df.sort_values(['column_name', 'position'])
+        values = {column_name: [] for column_name in column_names}
+        for column_name, value in zip(df['column_name'], df['value']):
+            values[column_name].append(None if pd.isna(value) else self._native_value(value, column_types.get(column_name)))
+        return json.dumps(values)
+
+    @staticmethod
+    def _native_value(value, column_type: str = None):
+        """Converts a sample value rendered as text back to the JSON type of its database type."""
+        base_type = (column_type or '').split('(')[0].strip().lower()
+        if not isinstance(value, str) or not base_type:
+            return value
+        try:
+            if base_type in BOOLEAN_TYPES:
+                return value.strip().lower() in ('1', 'true', 't', 'yes')
+            if base_type in NUMERIC_TYPES:
+                return int(value) if re.fullmatch(r'\s*-?\d+\s*', value) else float(value)
+        except ValueError:
+            return value
+        if base_type in TEMPORAL_TYPES or base_type.startswith(('timestamp', 'time')):
+            # drop an all-zero fractional part, matching the pandas rendering of whole seconds
+            return re.sub(r'\.0+(?=$|\s)', '', value)
+        return value
+    
     def get_available_tools(self) -> str:
         return {
             "list_database_tables": self.list_database_tables,
@@ -58,8 +619,13 @@ class DatabaseClient:
             "get_column_values": self.get_column_values
         }
     
-    def get_tools_manifest(self) -> str:
-        return [
+    def get_tools_manifest(self) -> list:
+        return get_tools_manifest()
+
+
+def get_tools_manifest() -> list:
+    """Returns the function calling definitions of the tools in `get_available_tools`."""
+    return [
         {
             "type": "function",
             "function": {
@@ -170,4 +736,4 @@ class DatabaseClient:
             }
         }
 
-    ]
\ No newline at end of file
+    ]
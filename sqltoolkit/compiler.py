@@ -2,8 +2,30 @@ import sqlglot
 from sqlglot.errors import ParseError
 from sqlglot import parse, exp
 from sqlglot.errors import ParseError
+from sqlglot.dialects.dialect import Dialect, NormalizationStrategy
+from sqlglot.optimizer.qualify import qualify
+from sqlglot.optimizer.scope import traverse_scope
+from sqlglot.schema import MappingSchema
+from functools import lru_cache
 import json
 
+# number of parsed queries kept by `parse_query`, keyed by (dialect, query text)
+AST_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def parse_query(query: str, dialect: str = None) -> tuple:
+    """
+    Parses the statements of a query once per dialect and caches the result, so repeated
+    validations of the same query (agent retries, evaluation runs) skip parsing. Returns a
+    tuple of (statements, error) where error is the ParseError message or None.
+    The cached statements are shared: copy them before modifying them.
+    """
+    try:
+        return tuple(parse(query, read=dialect)), None
+    except ParseError as e:
+        return (), str(e)
+
 class SQLQueryChecker:
     """
     Provides a method to compile (validate) a SQL query without
@@ -11,17 +33,23 @@ class SQLQueryChecker:
     using sqlparse and some dialect-specific checks.
     Ensures only SELECT queries are allowed and that TOP is only used 
     for SQL Server.
+
+    Tables and columns are checked against `reference_schema` (a list of
+    `{"table": ..., "columns": [...]}`) by resolving the query locally with sqlglot.
+    With `llm_fallback=True`, queries sqlglot cannot resolve are sent to the model instead.
     """
     def __init__(self, 
                  openai_client, 
                  model_deployment, 
                  dialect: str = "Postgres",
                  reference_schema=None,
+                 llm_fallback: bool = False,
                 ):
         self.dialect = dialect.lower()
         self.openai_client = openai_client
         self.model_deployment = model_deployment
         self.reference_schema = reference_schema
+        self.llm_fallback = llm_fallback
 
     def _extract_entities(self, query: str) -> list[str]:
         prompt = f"""You are a SQL expert. Your role is to extract columns and tables from a query so that a program can validate their existence in the database. You must extract only the tables and columns that would be found in the database without their alias. Do not extract any alias or temporary table. 
@@ -51,8 +79,113 @@ class SQLQueryChecker:
         return json.loads(response.choices[0].message.content)
 
 
+    def _case_insensitive(self) -> bool:
+        return Dialect.get_or_raise(self.dialect).normalization_strategy == NormalizationStrategy.CASE_INSENSITIVE
+
+    def _sqlglot_schema(self) -> MappingSchema:
+        """Builds a sqlglot schema from `reference_schema`, keyed by schema and table when every table name has a schema."""
+        tables = [(ref['table'].rpartition('.'), ref.get('columns', [])) for ref in self.reference_schema or []]
+        mapping = {}
+        for (db, _, name), columns in tables:
+            columns = {column: "UNKNOWN" for column in columns}
+            if all(parts[0] for parts, _ in tables):
+                mapping.setdefault(db, {})[name] = columns
+            else:
+                mapping[name] = columns
+        # case sensitive dialects keep the reference names as is, so quoted identifiers match exactly
+        return MappingSchema(mapping, dialect=self.dialect, normalize=self._case_insensitive())
+
+    def _reference_table_name(self, table: exp.Table) -> str:
+        """Returns the reference schema name of a table of the query, or its name as written if unknown."""
+        name = f"{table.db}.{table.name}" if table.db else table.name
+        fold = str.lower if self._case_insensitive() else str
+        matches = [ref.get('table') for ref in self.reference_schema or []
+                   if fold(ref.get('table')) == fold(name)
+                   or (not table.db and fold(ref.get('table').rpartition('.')[2]) == fold(name))]
+        return matches[0] if len(matches) == 1 else name
+
+    def _reference_column_name(self, table_name: str, column_name: str) -> str:
+        if not self._case_insensitive():
+            return column_name
+        ref_columns = next((ref.get('columns', []) for ref in self.reference_schema or [] if ref.get('table') == table_name), [])
+        return next((column for column in ref_columns if column.lower() == column_name.lower()), column_name)
+
+    def _extract_entities_local(self, query: str) -> tuple:
+        """
+        Resolves the tables and columns a query reads with sqlglot scope analysis, after
+        qualifying it against the reference schema so aliases, CTEs and subqueries map
+        back to real tables. Returns the entities in the `_extract_entities` format, the
+        columns that could not be attributed to a single table, and the parse or
+        qualification error if any (None otherwise).
+
+        When qualification fails (e.g. sqlglot rejects `c.unknown_column`), the query is
+        resolved as written, so explicitly qualified columns are still reported.
+        """
+        no_entities = {"tables": [], "columns": []}
+        statements, error = parse_query(query, self.dialect)
+        if error:
+            return no_entities, [], f"the query could not be parsed ({error})"
+        try:
+            schema = self._sqlglot_schema()
+            scopes = []
+            for statement in statements:
+                if statement is None:
+                    continue
+                try:
+                    # qualify rewrites the tree, the cached statement is left untouched
+                    statement = qualify(statement.copy(), schema=schema, dialect=self.dialect,
+                                        validate_qualify_columns=False, quote_identifiers=False, identify=False)
+                except Exception as e:
+                    error = str(e)
+                    statement = statement.copy()
+                scopes.extend(traverse_scope(statement))
+        except Exception as e:
+            return no_entities, [], str(e)
+
+        tables, columns, unresolved = [], [], []
+        for scope in scopes:
+            for source in scope.sources.values():
+                if isinstance(source, exp.Table):
+                    table_name = self._reference_table_name(source)
+                    if table_name not in tables:
+                        tables.append(table_name)
+
+            for column in scope.columns:
+                source = None
+                if column.table:
+                    # correlated subqueries read the sources of their enclosing scopes
+                    outer = scope
+                    while outer is not None and source is None:
+                        source = outer.sources.get(column.table)
+                        outer = outer.parent
+                elif len(scope.sources) == 1 and isinstance(next(iter(scope.sources.values())), exp.Table):
+                    # a column qualify could not find in the only table, reported against it
+                    source = next(iter(scope.sources.values()))
+
+                if isinstance(source, exp.Table):
+                    table_name = self._reference_table_name(source)
+                    entity = f"{table_name}.{self._reference_column_name(table_name, column.name)}"
+                    if entity not in columns:
+                        columns.append(entity)
+                elif source is None:
+                    unresolved.append(column.sql(dialect=self.dialect))
+                # columns of CTEs and derived tables are checked in the scope that defines them
+
+        return {"tables": tables, "columns": columns}, unresolved, error
+
     def _check_table_and_column_existence(self, query: str) -> bool:
-        entities = self._extract_entities(query)
+        entities, unresolved, error = self._extract_entities_local(query)
+        # tables and columns resolved locally are reported first, even when the rest of the query is not
+        self._check_entities(entities)
+        if not unresolved and not error:
+            return True
+        if self.llm_fallback:
+            return self._check_entities(self._extract_entities(query))
+        if unresolved:
+            raise ValueError(f"Could not resolve column {', '.join(unresolved)} to a single table of the reference schema.")
+        raise ValueError(f"Could not resolve the query against the reference schema: {error}")
+
+    def _check_entities(self, entities: dict) -> bool:
         table_names = entities.get("tables", [])
         column_names = entities.get("columns", [])
         ref_tables = [ref.get('table') for ref in self.reference_schema or []]
@@ -75,12 +208,11 @@ class SQLQueryChecker:
         By default uses 'ansi' for a generic SQL style. Returns True if parsed
         successfully; False if a ParseError is raised.
         """
-        try:
-            sqlglot.parse_one(query, read=dialect)
-            return True
-        except ParseError as pe:
-            print(f"Syntax error detected: {pe}")
-        return False
+        _, error = parse_query(query, dialect)
+        if error:
+            print(f"Syntax error detected: {error}")
+            return False
+        return True
     
     def _is_select_statement(self, query: str) -> bool:
         """
@@ -98,7 +230,9 @@ class SQLQueryChecker:
             raise ValueError("Empty or whitespace-only query")
 
         try:
-            expressions = parse(query)
+            expressions, error = parse_query(query, self.dialect)
+            if error:
+                raise ParseError(error)
 
             if not expressions: #handle empty parse
                 return False
@@ -121,6 +255,8 @@ class SQLQueryChecker:
     def validate_query(self, query: str) -> dict:
         """
         Runs all checks on the SQL query and returns a dictionary with the validation result.
+        The query is parsed once for the checker's dialect (see `parse_query`) and the
+        cached statements are shared by every check.
 
         Args:
             query: The SQL query string.
@@ -1,16 +1,69 @@
 # my_module/sample_class.py
+import csv
+import importlib
+import os
+import sqlite3
 import struct
-import pyodbc
-from azure.identity import DefaultAzureCredential
-import psycopg2
-from psycopg2 import OperationalError
-import snowflake.connector
+import threading
+import time
+import uuid
 
+# connector classes by `type`; database drivers are only imported when a connection is opened
+CONNECTORS = {}
 
+# pip package providing each driver module, for the error raised when it is missing
+DRIVER_PACKAGES = {
+    'pyodbc': 'pyodbc',
+    'psycopg2': 'psycopg2-binary',
+    'snowflake.connector': 'snowflake-connector-python',
+    'azure.identity': 'azure-identity',
+}
+
+
+def register_connector(connector_type: str):
+    """Class decorator adding a connector to the registry under `connector_type`."""
+    def decorator(cls):
+        CONNECTORS[connector_type] = cls
+        return cls
+    return decorator
+
+
+def get_connector_class(connector_type: str):
+    if connector_type not in CONNECTORS:
+        raise ValueError(f"Unsupported connector type: {connector_type}. Available types: {', '.join(CONNECTORS)}")
+    return CONNECTORS[connector_type]
+
+
+def create_connector(connector_type: str, **kwargs):
+    """Creates a connector from its type, e.g. `create_connector('POSTGRESQL', host=..., database=...)`."""
+    return get_connector_class(connector_type)(**kwargs)
+
+
+def import_driver(module_name: str):
+    """Imports a driver module on first use, with an install hint if it is missing."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        package = DRIVER_PACKAGES.get(module_name, module_name)
+        raise ImportError(f"{module_name} is required for this connector, install it with `pip install {package}`.") from e
+
+
+SQL_COPT_SS_ACCESS_TOKEN = 1256
+AZURE_SQL_SCOPE = "https://database.windows.net/.default"
+
+
+@register_connector('AZURE_SQL')
 class AzureSQLConnector:
-    def __init__(self, server: str, database: str, use_entra_id: bool = True, username: str = None, password: str = None):
+    def __init__(self, server: str, database: str, use_entra_id: bool = True, username: str = None, password: str = None,
+                 token_refresh_margin: float = 300.0):
         self.type = 'AZURE_SQL'
         self.use_entra_id = use_entra_id
+        # the credential is created on first use and the access token reused until
+        # `token_refresh_margin` seconds before it expires
+        self.token_refresh_margin = token_refresh_margin
+        self._credential = None
+        self._token = None
+        self._token_lock = threading.Lock()
         if use_entra_id:
             self.connection_string = f'Driver={{ODBC Driver 18 for SQL Server}};Server=tcp:{server},1433;Database={database};Encrypt=yes;TrustServerCertificate=no;Connection Timeout=30;'
         else:
@@ -18,13 +71,22 @@ class AzureSQLConnector:
                 raise ValueError("Username and password must be provided for user password authentication.")
             self.connection_string = f'Driver={{ODBC Driver 18 for SQL Server}};Server=tcp:{server},1433;Database={database};Uid={username};Pwd={password};Encrypt=yes;TrustServerCertificate=no;Connection Timeout=30;'
 
+    def get_token(self) -> str:
+        """Returns a cached Entra ID access token, refreshing it under a lock so concurrent connects share one request."""
+        with self._token_lock:
+            if self._token is None or self._token.expires_on - self.token_refresh_margin <= time.time():
+                if self._credential is None:
+                    identity = import_driver('azure.identity')
+                    self._credential = identity.DefaultAzureCredential(exclude_interactive_browser_credential=False)
+                self._token = self._credential.get_token(AZURE_SQL_SCOPE)
+            return self._token.token
+
     def get_conn(self):
+        pyodbc = import_driver('pyodbc')
         try:
             if self.use_entra_id:
-                credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
-                token_bytes = credential.get_token("https://database.windows.net/.default").token.encode("UTF-16-LE")
+                token_bytes = self.get_token().encode("UTF-16-LE")
                 token_struct = struct.pack(f'<I{len(token_bytes)}s', len(token_bytes), token_bytes)
-                SQL_COPT_SS_ACCESS_TOKEN = 1256
                 conn = pyodbc.connect(self.connection_string, attrs_before={SQL_COPT_SS_ACCESS_TOKEN: token_struct})
             else:
                 conn = pyodbc.connect(self.connection_string)
@@ -32,30 +94,35 @@ class AzureSQLConnector:
         except pyodbc.Error as e:
             raise RuntimeError(f"Error connecting to Azure SQL Database: {e}")
         
+@register_connector('POSTGRESQL')
 class PostgreSQLConnector:
     def __init__(self, host: str, database: str, username: str, password: str, port: int = 5432):
         self.type = 'POSTGRESQL'
         self.connection_string = f"dbname='{database}' user='{username}' password='{password}' host='{host}' port='{port}'"
 
     def get_conn(self):
+        psycopg2 = import_driver('psycopg2')
         try:
             conn = psycopg2.connect(self.connection_string)
             return conn
-        except OperationalError as e:
+        except psycopg2.OperationalError as e:
             raise RuntimeError(f"Error connecting to PostgreSQL Database: {e}")
 
+@register_connector('ODBC')
 class OdbcConnector:
     def __init__(self, connection_string: str):
         self.type = 'ODBC'
         self.connection_string = connection_string
 
     def get_conn(self):
+        pyodbc = import_driver('pyodbc')
         try:
             conn = pyodbc.connect(self.connection_string)
             return conn
         except pyodbc.Error as e:
             raise RuntimeError(f"Error connecting to Database: {e}")
 
+@register_connector('SNOWFLAKE')
 class SnowflakeConnector:
     def __init__(self, user: str, password: str, account: str, warehouse: str, database: str, schema: str, role: str = None, **kwargs):
         """
@@ -91,8 +158,115 @@ class SnowflakeConnector:
         """
         Establish and return a connection to Snowflake.
         """
+        snowflake_connector = import_driver('snowflake.connector')
         try:
-            conn = snowflake.connector.connect(**self.connection_params)
+            conn = snowflake_connector.connect(**self.connection_params)
             return conn
         except Exception as e:
-            raise RuntimeError(f"Error connecting to Snowflake: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Error connecting to Snowflake: {e}")
+
+    def is_autocommit(self, conn) -> bool:
+        """
+        Snowflake sessions autocommit unless `autocommit=False` is passed to connect. The
+        connection's `autocommit` is a setter method, so the pool asks the connector instead
+        of rolling back (one more round trip) every connection it gets back.
+        """
+        return self.connection_params.get('autocommit', True) is not False
+
+@register_connector('SQLITE')
+class SQLiteConnector:
+    # header of the column documentation CSVs (e.g. evaluation/debit_card_specializing_doc)
+    DOCUMENTATION_COLUMNS = {'original_column_name', 'column_description', 'data_format'}
+    DOCUMENTATION_TYPES = {'integer': 'INTEGER', 'real': 'REAL', 'date': 'DATE', 'datetime': 'DATETIME', 'text': 'TEXT'}
+    DESCRIPTIONS_COLUMNS = "(table_name TEXT NOT NULL, column_name TEXT NOT NULL, description TEXT, PRIMARY KEY (table_name, column_name))"
+
+    def __init__(self, database: str = ':memory:'):
+        """
+        Initialize a local SQLite connector, for offline development and benchmarks.
+
+          - database: path of the database file, or ':memory:' for an in-memory database
+            shared by every connection of this connector and kept alive as long as it exists.
+
+        Column descriptions loaded by `load_documentation_csv` are stored in a
+        `sqltoolkit_column_descriptions` table. Other databases are never written to: every
+        connection attaches an empty in-memory table of the same name, which the schema
+        queries read when the database has none.
+        """
+        self.type = 'SQLITE'
+        self.database = database
+        if database == ':memory:':
+            self.connection_string = f"file:sqltoolkit_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            self.connection_string = database
+        # the first connection also keeps a shared in-memory database alive
+        self._keepalive = self.get_conn()
+
+    def get_conn(self):
+        try:
+            conn = sqlite3.connect(self.connection_string, uri=self.database == ':memory:', check_same_thread=False)
+            # unqualified names resolve to the main database first, then to attached ones
+            conn.execute("ATTACH DATABASE ':memory:' AS sqltoolkit_meta")
+            conn.execute(f"CREATE TABLE sqltoolkit_meta.sqltoolkit_column_descriptions {self.DESCRIPTIONS_COLUMNS}")
+            return conn
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Error connecting to SQLite Database: {e}")
+
+    def close(self) -> None:
+        """Closes the connection keeping the database open; an in-memory database is dropped."""
+        self._keepalive.close()
+
+    def load_csv(self, path: str, table_name: str = None, if_exists: str = 'replace') -> str:
+        """Loads a CSV file of data rows into a table (named after the file by default) and returns its name."""
+        import pandas as pd
+
+        table_name = table_name or os.path.splitext(os.path.basename(path))[0]
+        df = pd.read_csv(path, encoding='utf-8-sig')
+        df.to_sql(table_name, self._keepalive, if_exists=if_exists, index=False)
+        return table_name
+
+    def load_documentation_csv(self, path: str, table_name: str = None) -> str:
+        """
+        Creates an empty table from a column documentation CSV (original_column_name,
+        column_name, column_description, data_format, value_description), storing the
+        descriptions for `get_table_schema`. Returns the table name.
+        """
+        table_name = table_name or os.path.splitext(os.path.basename(path))[0]
+        with open(path, newline='', encoding='utf-8-sig', errors='replace') as f:
+            rows = [row for row in csv.DictReader(f) if (row.get('original_column_name') or '').strip()]
+
+        columns, descriptions = [], []
+        for row in rows:
+            name = row['original_column_name'].strip()
+            column_type = self.DOCUMENTATION_TYPES.get((row.get('data_format') or '').strip().lower(), 'TEXT')
+            columns.append('"' + name.replace('"', '""') + '" ' + column_type)
+            description = ' '.join(
+                (row.get(key) or '').strip() for key in ('column_description', 'value_description') if (row.get(key) or '').strip()
+            )
+            descriptions.append((table_name, name, description or None))
+
+        quoted_table = '"' + table_name.replace('"', '""') + '"'
+        with self._keepalive:
+            self._keepalive.execute(f"CREATE TABLE IF NOT EXISTS main.sqltoolkit_column_descriptions {self.DESCRIPTIONS_COLUMNS}")
+            self._keepalive.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+            self._keepalive.execute(f"CREATE TABLE {quoted_table} ({', '.join(columns)})")
+            self._keepalive.execute("DELETE FROM main.sqltoolkit_column_descriptions WHERE table_name = ?", (table_name,))
+            self._keepalive.executemany("INSERT INTO main.sqltoolkit_column_descriptions VALUES (?, ?, ?)", descriptions)
+        return table_name
+
+    def load_directory(self, directory: str) -> list:
+        """
+        Loads every CSV file of a directory, one table per file. Column documentation files
+        create empty, described tables and other files are loaded as data. Returns the table names.
+        """
+        table_names = []
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.lower().endswith('.csv'):
+                continue
+            path = os.path.join(directory, file_name)
+            with open(path, newline='', encoding='utf-8-sig', errors='replace') as f:
+                header = {column.strip() for column in next(csv.reader(f), [])}
+            if self.DOCUMENTATION_COLUMNS <= header:
+                table_names.append(self.load_documentation_csv(path))
+            else:
+                table_names.append(self.load_csv(path))
+        return table_names
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used to size batches (~4 characters per token)."""
+    return len(text or "") // 4 + 1
+
+
+def make_batches(texts: List[str], max_batch_items: int = 256, max_batch_tokens: int = 8000) -> List[List[int]]:
+    """
+    Groups the indices of `texts` into batches holding at most `max_batch_items` items
+    and about `max_batch_tokens` tokens. A single text larger than the token budget
+    gets a batch of its own.
+    """
+    batches = []
+    current, current_tokens = [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_batch_items or current_tokens + tokens > max_batch_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def embed_texts(openai_client, texts: List[str], model: str,
+                max_batch_items: int = 256, max_batch_tokens: int = 8000, max_workers: int = 4) -> List[List[float]]:
+    """
+    Returns the embedding of every text in `texts`, in the same order.
+
+    Texts are packed into multi-input `embeddings.create` requests bounded by item and
+    token count, and up to `max_workers` requests are sent concurrently.
+    """
+    batches = make_batches(texts, max_batch_items, max_batch_tokens)
+
+    def embed_batch(batch):
+        response = openai_client.embeddings.create(input=[texts[i] for i in batch], model=model)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    embeddings = [None] * len(texts)
+    if max_workers > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(embed_batch, batches))
+    else:
+        results = [embed_batch(batch) for batch in batches]
+
+    for batch, batch_embeddings in zip(batches, results):
+        for i, embedding in zip(batch, batch_embeddings):
+            embeddings[i] = embedding
+    return embeddings
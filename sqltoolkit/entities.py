@@ -1,8 +1,10 @@
 from typing import List, Optional, Any  
 from pydantic import BaseModel, Field
 from sqltoolkit.client import DatabaseClient
-from sqltoolkit.prompts import COLUMN_DEFINITION_PROMPT, TABLE_SUMMARY_PROMPT, TABLE_READABLE_NAME_PROMPT
+from sqltoolkit.cache import cached_chat_completion
+from sqltoolkit.prompts import COLUMN_DEFINITION_PROMPT, COLUMN_DEFINITIONS_BATCH_PROMPT, TABLE_SUMMARY_PROMPT, TABLE_READABLE_NAME_PROMPT
 import json
+import hashlib
 
 
 class TableColumn(BaseModel):  
@@ -13,23 +15,19 @@ class TableColumn(BaseModel):
     sample_values: Optional[List[Any]] = Field(None, description="Sample values of the column")
     primary_key: bool = Field(False, description="Indicates if the column is a primary key")  
   
-    def get_column_values(self, sql_client, table_name) -> list:  
-        """Populates the sample values for the column."""
-        values = json.loads(sql_client.get_column_values(table_name, self.name))
+    def get_column_values(self, sql_client, table_name, sample_percent: float = None) -> list:  
+        """Populates the sample values for the column, reading only `sample_percent` percent of the table if set."""
+        values = json.loads(sql_client.get_column_values(table_name, self.name, sample_percent=sample_percent))
         self.sample_values = [ val.get(self.name) for val in values if val.get(self.name) is not None]
     
-    def get_llm_definition(self, table_json, aoai_client, aoai_deployment, extra_context) -> str:
+    def get_llm_definition(self, table_json, aoai_client, aoai_deployment, extra_context, cache=None) -> str:
         """Returns the description of the column from the LLM."""
         prompt = COLUMN_DEFINITION_PROMPT.format(column_name=self.name, table_json=table_json, extra_context=extra_context)
         
         messages = [{"role":"system", "content": "You are a data analyst that can help summarize SQL tables."}, 
         {"role": "user", "content": prompt}]
 
-        response = aoai_client.chat.completions.create(
-                model=aoai_deployment,
-                messages=messages)
-        
-        response_message = response.choices[0].message.content
+        response_message = cached_chat_completion(aoai_client, aoai_deployment, messages, cache=cache)
         self.definition = response_message
 
   
@@ -39,11 +37,13 @@ class Table(BaseModel):
     description: Optional[str] = Field(None, description="A description of the table")  
     columns: Optional[List[TableColumn]] = Field(None, description="The columns of the table")
     embedding: Optional[Any] = Field(None, description="An embedding of the table")
+    fingerprint: Optional[str] = Field(None, description="A hash of the table schema and sample values")
+    indexed_fingerprint: Optional[str] = Field(None, description="The fingerprint last pushed successfully to the search index")
 
     class Config:  
         arbitrary_types_allowed = True
   
-    def get_table_description(self, aoai_client, aoai_deployment, extra_context) -> str:  
+    def get_table_description(self, aoai_client, aoai_deployment, extra_context, cache=None) -> str:  
         """Returns the description of the table."""
 
         table_summary_prompt = TABLE_SUMMARY_PROMPT.format(table_json=self.model_dump(exclude=['db_client']), 
@@ -52,15 +52,11 @@ class Table(BaseModel):
         messages = [{"role":"system", "content": "You are a data analyst that can help summarize SQL tables."}, 
                     {"role": "user", "content": table_summary_prompt}]
 
-        response = aoai_client.chat.completions.create(
-                model=aoai_deployment,
-                messages=messages)
-
-        response_message = response.choices[0].message.content  
+        response_message = cached_chat_completion(aoai_client, aoai_deployment, messages, cache=cache)
         
         self.description = response_message
 
-    def get_table_readable_name(self, aoai_client, aoai_deployment, extra_context) -> str:
+    def get_table_readable_name(self, aoai_client, aoai_deployment, extra_context, cache=None) -> str:
         """Returns the business readable name of the table."""
         table_name = self.name
         table_readable_name_prompt = TABLE_READABLE_NAME_PROMPT.format(
@@ -72,36 +68,98 @@ class Table(BaseModel):
         messages = [{"role":"system", "content": "You are a data analyst that can help summarize SQL tables."}, 
                     {"role": "user", "content": table_readable_name_prompt}]
 
-        response = aoai_client.chat.completions.create(
-                model=aoai_deployment,
-                messages=messages)
-
-        response_message = response.choices[0].message.content  
+        response_message = cached_chat_completion(aoai_client, aoai_deployment, messages, cache=cache)
         
         self.business_readable_name = response_message
 
-    def get_columns(self, sql_client) -> List[TableColumn]:  
-        """Returns the columns of the table."""  
-        table_schema = json.loads(sql_client.get_table_schema(self.name))
-        column_list = table_schema.get("Columns")
+    def compute_fingerprint(self) -> str:
+        """Returns a hash of the table name, column names, types, keys, descriptions and sample values."""
+        schema = {
+            "name": self.name,
+            "columns": [column.model_dump(include={'name', 'type', 'primary_key', 'description', 'sample_values'})
+                        for column in self.columns or []],
+        }
+        return hashlib.sha256(json.dumps(schema, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get_columns(self, sql_client, column_list: list = None) -> List[TableColumn]:  
+        """Returns the columns of the table. Uses `column_list` when the schema was already fetched in bulk."""  
+        if column_list is None:
+            table_schema = json.loads(sql_client.get_table_schema(self.name))
+            column_list = table_schema.get("Columns")
         
         self.columns = [TableColumn(
             name=column["name"],
             type=column["type"],
-            primary_key=column["key_type"]=='PRIMARY KEY',
-            description=column["column_description"],
+            primary_key=column.get("key_type")=='PRIMARY KEY',
+            description=column.get("column_description"),
         ) for column in column_list]
     
-    def extract_column_values(self, sql_client) -> None:  
-        """Extracts sample values for each column in the table."""  
+    def extract_column_values(self, sql_client, single_query: bool = True, sample_row_budget: int = None) -> None:  
+        """Extracts sample values for each column in the table.
+
+        With `single_query`, the values of all columns are collected in one statement and
+        the per-column queries are only used if that statement fails. With `sample_row_budget`,
+        tables whose row-count statistics exceed the budget are sampled instead of fully scanned.
+        """  
+        sample_percent = sql_client.get_sample_percent(self.name, sample_row_budget) if sample_row_budget else None
+
+        if single_query and self.columns:
+            try:
+                values = json.loads(sql_client.get_table_column_values(self.name, [column.name for column in self.columns],
+                                                                       sample_percent=sample_percent,
+                                                                       column_types={column.name: column.type for column in self.columns}))
+                for column in self.columns:
+                    column.sample_values = [val for val in values.get(column.name, []) if val is not None]
+                return
+            except Exception as e:
+                print(f"Could not extract sample values of {self.name} in one query, falling back to one query per column: {e}")
+
         for column in self.columns:  
-            column.get_column_values(sql_client, self.name)
+            column.get_column_values(sql_client, self.name, sample_percent=sample_percent)
+
+    def extract_llm_column_definitions(self, aoai_client, aoai_deployment, extra_context, batch_size: int = None, cache=None) -> None:
+        """Extracts AI generated definitions for each column in the table.
 
-    def extract_llm_column_definitions(self, aoai_client, aoai_deployment, extra_context) -> None:
-        """Extracts AI generated definitions for each column in the table."""
+        When `batch_size` is set, definitions are requested for up to `batch_size` columns
+        per call (0 means all columns in a single call). Columns missing from a batched
+        answer fall back to one call per column. Responses are replayed from `cache` when provided.
+        """
+        if not self.columns:
+            return
         table_json = self.json(exclude=['db_client'])
-        for column in self.columns:
-            column.get_llm_definition(table_json, aoai_client, aoai_deployment, extra_context)
-    
+        if batch_size is None:
+            for column in self.columns:
+                column.get_llm_definition(table_json, aoai_client, aoai_deployment, extra_context, cache=cache)
+            return
+
+        batch_size = batch_size or len(self.columns)
+        for i in range(0, len(self.columns), batch_size):
+            batch = self.columns[i:i + batch_size]
+            definitions = self._get_llm_column_definitions_batch(batch, table_json, aoai_client, aoai_deployment, extra_context,
+                                                                  cache=cache)
+            for column in batch:
+                definition = definitions.get(column.name)
+                if isinstance(definition, str) and definition.strip():
+                    column.definition = definition
+                else:
+                    column.get_llm_definition(table_json, aoai_client, aoai_deployment, extra_context, cache=cache)
+
+    @staticmethod
+    def _get_llm_column_definitions_batch(columns, table_json, aoai_client, aoai_deployment, extra_context, cache=None) -> dict:
+        """Returns a mapping of column name to definition for a batch of columns in a single LLM call."""
+        prompt = COLUMN_DEFINITIONS_BATCH_PROMPT.format(column_names=json.dumps([column.name for column in columns]),
+                                                        table_json=table_json,
+                                                        extra_context=extra_context)
 
-  
+        messages = [{"role":"system", "content": "You are a data analyst that can help summarize SQL tables."}, 
+                    {"role": "user", "content": prompt}]
+
+        try:
+            response_message = cached_chat_completion(aoai_client, aoai_deployment, messages, cache=cache,
+                                                      response_format={"type": "json_object"})
+            definitions = json.loads(response_message)
+        except (json.JSONDecodeError, TypeError) as e:
+            print(f"Could not parse batched column definitions: {e}")
+            return {}
+
+        return definitions if isinstance(definitions, dict) else {}
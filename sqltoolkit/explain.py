@@ -0,0 +1,86 @@
+import json
+import xml.etree.ElementTree as ET
+
+SHOWPLAN_NAMESPACE = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_postgres_plan(plan) -> dict:
+    """Parses the output of `EXPLAIN (FORMAT JSON)` into the estimated rows and total cost of the root node."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]['Plan']
+    return {
+        'engine': 'POSTGRESQL',
+        'estimated_rows': _to_float(root.get('Plan Rows')),
+        'estimated_cost': _to_float(root.get('Total Cost')),
+        'root_operation': root.get('Node Type'),
+    }
+
+
+def parse_snowflake_plan(plan) -> dict:
+    """
+    Parses the output of `EXPLAIN USING JSON`. Snowflake does not estimate rows, so the
+    cost is the number of bytes the query is expected to scan after partition pruning.
+    """
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    stats = plan.get('GlobalStats', {})
+    return {
+        'engine': 'SNOWFLAKE',
+        'estimated_rows': None,
+        'estimated_cost': _to_float(stats.get('bytesAssigned')),
+        'partitions_total': stats.get('partitionsTotal'),
+        'partitions_assigned': stats.get('partitionsAssigned'),
+    }
+
+
+def parse_sqlserver_plan(plan: str) -> dict:
+    """Parses a SHOWPLAN_XML document, using the largest row estimate and the summed
+    subtree cost of its statements."""
+    root = ET.fromstring(plan)
+    statements = root.iter(f'{SHOWPLAN_NAMESPACE}StmtSimple')
+    rows, cost = [], []
+    for statement in statements:
+        rows.append(_to_float(statement.get('StatementEstRows')))
+        cost.append(_to_float(statement.get('StatementSubTreeCost')))
+    rows = [r for r in rows if r is not None]
+    cost = [c for c in cost if c is not None]
+    return {
+        'engine': 'AZURE_SQL',
+        'estimated_rows': max(rows) if rows else None,
+        'estimated_cost': sum(cost) if cost else None,
+    }
+
+
+PLAN_PARSERS = {
+    'AZURE_SQL': parse_sqlserver_plan,
+    'POSTGRESQL': parse_postgres_plan,
+    'SNOWFLAKE': parse_snowflake_plan,
+}
+
+
+def parse_plan(db_type: str, plan) -> dict:
+    parser = PLAN_PARSERS.get(db_type)
+    if parser is None:
+        raise ValueError(f"Query plans are not supported for database type: {db_type}")
+    return parser(plan)
+
+
+def check_estimate(estimate: dict, max_estimated_rows: float = None, max_estimated_cost: float = None) -> dict:
+    """Sets `allowed` to False and a `reason` on a parsed plan estimate when it exceeds the thresholds."""
+    reasons = []
+    rows, cost = estimate.get('estimated_rows'), estimate.get('estimated_cost')
+    if max_estimated_rows is not None and rows is not None and rows > max_estimated_rows:
+        reasons.append(f"estimated rows {rows:,.0f} exceed the limit of {max_estimated_rows:,.0f}")
+    if max_estimated_cost is not None and cost is not None and cost > max_estimated_cost:
+        reasons.append(f"estimated cost {cost:,.2f} exceeds the limit of {max_estimated_cost:,.2f}")
+    estimate['allowed'] = not reasons
+    estimate['reason'] = "; ".join(reasons) or None
+    return estimate
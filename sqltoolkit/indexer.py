@@ -1,6 +1,10 @@
 import json
 from sqltoolkit.entities import Table
+from sqltoolkit.embeddings import embed_texts
+from sqltoolkit.manifest import write_ndjson_manifest, ManifestReader
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from azure.search.documents.indexes import SearchIndexClient
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes.models import (
@@ -25,12 +29,16 @@ from azure.core.credentials import AzureKeyCredential
 import re
 
 class DatabaseIndexer:
-    def __init__(self, client, openai_client, aoai_deployment, embedding="text-embedding-3-small", extra_context=None):
+    def __init__(self, client, openai_client, aoai_deployment, embedding="text-embedding-3-small", extra_context=None,
+                 column_batch_size=None, llm_cache=None, sample_row_budget=None):
         self.client = client
         self.openai_client = openai_client
         self.aoai_deployment = aoai_deployment
         self.embedding = embedding
         self.extra_context = extra_context
+        self.column_batch_size = column_batch_size
+        self.llm_cache = llm_cache
+        self.sample_row_budget = sample_row_budget
         
         self.logger = logging.getLogger(self.__class__.__name__)
         self.logger.setLevel(logging.INFO)
@@ -42,7 +50,23 @@ class DatabaseIndexer:
             self.logger.addHandler(handler)
         self.logger.propagate = False
 
-    def fetch_and_describe_tables(self, table_list: list = None, regex_filter: str = None):
+    def fetch_and_describe_tables(self, table_list: list = None, regex_filter: str = None, max_workers: int = 1,
+                                  previous_manifest: dict = None):
+        """
+        Fetches the tables from the database and generates their metadata.
+
+        Tables are processed by up to `max_workers` threads at once. The returned
+        manifest keeps the order of the table list, and a table that fails is logged,
+        recorded in `self.failed_tables` and left out instead of aborting the run.
+
+        When `previous_manifest` (as written by `export_json_manifest`) is provided, tables
+        whose fingerprint is unchanged are reused from it without any LLM or embedding call.
+        The names of the tables to push to the index (new, changed, or whose last push did
+        not succeed) are recorded in `self.changed_tables`.
+        """
+        self.previous_tables = {
+            table.get('name'): table for table in (previous_manifest or {}).get('tables', []) if table.get('fingerprint')
+        }
 
         self.logger.info("Fetching tables from the database.")
         tables = json.loads(self.client.list_database_tables())
@@ -58,31 +82,103 @@ class DatabaseIndexer:
             tables = [table for table in tables if pattern.match(table)]
             self.logger.info(f"Filtered tables by regex: {tables}")
 
-        table_manifests = []
-        for table_name in tables:
-            self.logger.info(f"Processing table: {table_name}")
-            table = Table(name=table_name)
-            table.get_columns(self.client)
-            table.extract_column_values(self.client)
-            table.extract_llm_column_definitions(self.openai_client, self.aoai_deployment, self.extra_context)
-            table.get_table_description(self.openai_client, self.aoai_deployment, self.extra_context)
-            table.get_table_readable_name(self.openai_client, self.aoai_deployment, self.extra_context)
-            table_manifests.append(table)
-            self.logger.info(f"Completed processing table: {table_name}")
+        self.table_schemas = self._fetch_table_schemas(tables)
+
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._process_table_safe, tables))
+        else:
+            results = [self._process_table_safe(table_name) for table_name in tables]
+
+        self.failed_tables = {table_name: error for table_name, (_, error) in zip(tables, results) if error is not None}
+        table_manifests = [table for table, error in results if error is None]
 
         self.tables = table_manifests
+        reused = sum(1 for table in table_manifests if table.embedding is not None)
+        # `indexed_fingerprint` is only set once a push succeeds, so failed pushes are retried on the next run
+        self.changed_tables = {table.name for table in table_manifests if table.indexed_fingerprint != table.fingerprint}
+        self.logger.info(f"{len(table_manifests) - reused} new or changed tables, {reused} reused from the previous manifest, "
+                         f"{len(self.changed_tables)} to push to the index.")
+        if self.failed_tables:
+            self.logger.warning(f"Failed to process {len(self.failed_tables)} tables: {list(self.failed_tables)}")
         self.logger.info("Completed fetching and processing all tables.")
 
         return [t.model_dump() for t in table_manifests]
+
+    def _fetch_table_schemas(self, tables: list) -> dict:
+        """Fetches the columns of all tables in a single catalog query, or returns an empty dict
+        so that each table falls back to its own schema query."""
+        if not tables:
+            return {}
+        try:
+            schemas = json.loads(self.client.get_all_table_schemas(tables))
+            self.logger.info(f"Fetched the schema of {len(schemas)} tables in one query.")
+            return {table_name: schema.get('Columns') for table_name, schema in schemas.items()}
+        except Exception as e:
+            self.logger.warning(f"Could not fetch all table schemas at once, falling back to one query per table: {e}")
+            return {}
+
+    def _process_table(self, table_name: str) -> Table:
+        self.logger.info(f"Processing table: {table_name}")
+        table = Table(name=table_name)
+        table.get_columns(self.client, self.table_schemas.get(table_name))
+        table.extract_column_values(self.client, sample_row_budget=self.sample_row_budget)
+
+        fingerprint = table.compute_fingerprint()
+        previous = self.previous_tables.get(table_name)
+        if previous and previous.get('fingerprint') == fingerprint and previous.get('embedding') is not None:
+            self.logger.info(f"Table {table_name} is unchanged, reusing previous metadata.")
+            return Table(**previous)
+
+        table.extract_llm_column_definitions(self.openai_client, self.aoai_deployment, self.extra_context,
+                                             batch_size=self.column_batch_size, cache=self.llm_cache)
+        table.get_table_description(self.openai_client, self.aoai_deployment, self.extra_context, cache=self.llm_cache)
+        table.get_table_readable_name(self.openai_client, self.aoai_deployment, self.extra_context, cache=self.llm_cache)
+        table.fingerprint = fingerprint
+        self.logger.info(f"Completed processing table: {table_name}")
+        return table
+
+    def _process_table_safe(self, table_name: str):
+        try:
+            return self._process_table(table_name), None
+        except Exception as e:
+            self.logger.error(f"Error processing table {table_name}: {e}")
+            return None, e
     
-    def generate_table_embeddings(self):
-        for table in self.tables:
-            table.embedding =  self.openai_client.embeddings.create(input=[table.description], model=self.embedding).data[0].embedding
+    def generate_table_embeddings(self, max_batch_items: int = 256, max_batch_tokens: int = 8000, max_workers: int = 4):
+        """Generates the embedding of each table description using batched, concurrent requests.
+        Tables reused from a previous manifest keep their existing embedding."""
+        tables = [table for table in self.tables if table.embedding is None]
+        embeddings = embed_texts(self.openai_client,
+                                 [table.description for table in tables],
+                                 model=self.embedding,
+                                 max_batch_items=max_batch_items,
+                                 max_batch_tokens=max_batch_tokens,
+                                 max_workers=max_workers)
+        for table, embedding in zip(tables, embeddings):
+            table.embedding = embedding
     
+    @staticmethod
+    def load_json_manifest(path: str) -> dict:
+        """Loads a manifest written by `export_json_manifest` (or `export_ndjson_manifest` for
+        `.ndjson` files), or returns None if the file does not exist."""
+        try:
+            if path.endswith('.ndjson'):
+                return ManifestReader(path).to_dict()
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
     def export_json_manifest(self):
         return json.dumps(
             {"tables":[t.model_dump() for t in self.tables]},
               indent=4)
+
+    def export_ndjson_manifest(self, path: str, embedding_dtype: str = 'float32') -> dict:
+        """Streams the manifest to `path` as NDJSON with compact binary embeddings and an offset
+        index, so a single table can later be read with `ManifestReader` without parsing the rest."""
+        return write_ndjson_manifest(self.tables, path, embedding_dtype=embedding_dtype)
     
     def create_azure_ai_search_index(self, 
                                      search_endpoint, 
@@ -174,24 +270,106 @@ class DatabaseIndexer:
                                 vector_search=vector_search, semantic_search=semantic_search)
             result = index_client.create_or_update_index(index)
             self.logger.info(f"Index '{result.name}' created successfully.")
+            # a new index is empty, so every table has to be pushed
+            self.changed_tables = {t.name for t in self.tables}
     
-    def push_to_ai_search(self):
-        search_client = SearchClient(endpoint=self.search_endpoint, 
-                                     index_name=self.index_name, 
-                                     credential=AzureKeyCredential(self.search_credential))
+    def push_to_ai_search(self, only_changed: bool = True, max_batch_documents: int = 100,
+                          max_batch_bytes: int = 8 * 1024 * 1024, max_workers: int = 4,
+                          max_retries: int = 3, retry_backoff: float = 1.0, search_client=None):
+        """
+        Uploads the table metadata to Azure AI Search in batches bounded by document count
+        and payload size, with up to `max_workers` batches in flight at once.
+
+        The result of every document is inspected and only the failed keys are retried,
+        with exponential backoff. Returns a dictionary with the succeeded keys and the
+        error message of each key that still failed after `max_retries` retries.
+        Only the tables pushed successfully get their `indexed_fingerprint` set, so export
+        the manifest after pushing and the failed tables are pushed again on the next run.
+        """
+        if search_client is None:
+            search_client = SearchClient(endpoint=self.search_endpoint, 
+                                         index_name=self.index_name, 
+                                         credential=AzureKeyCredential(self.search_credential))
 
-        table_metadata = [t.model_dump() for t in self.tables]
+        tables = self.tables
+        if only_changed and getattr(self, 'changed_tables', None) is not None:
+            tables = [t for t in self.tables if t.name in self.changed_tables]
+        table_metadata = [t.model_dump(exclude={'fingerprint', 'indexed_fingerprint'}) for t in tables]
         self.logger.info(f"Pushing metadata for {len(table_metadata)} tables to Azure AI Search.")
 
-        # Push each record to the index
+        documents = []
         for table in table_metadata:
-            print(f"Pushing data for table {table['name']} to the index.")
             table['name_key'] = table['name'].replace(".","__")
-            for col in table['columns']:
-                col['sample_values'] = [str(val) for val in col['sample_values']]
+            for col in table['columns'] or []:
+                col['sample_values'] = [str(val) for val in col['sample_values'] or []]
+            documents.append(table)
+
+        batches = self._make_upload_batches(documents, max_batch_documents, max_batch_bytes)
+        upload = lambda batch: self._upload_batch_with_retry(search_client, batch, max_retries, retry_backoff)
+        if max_workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(upload, batches))
+        else:
+            results = [upload(batch) for batch in batches]
+
+        summary = {"succeeded": [], "failed": {}}
+        for succeeded, failed in results:
+            summary["succeeded"].extend(succeeded)
+            summary["failed"].update(failed)
+
+        # record what the index now holds, so the next run only pushes changed or failed tables
+        pushed_keys = set(summary["succeeded"])
+        changed_tables = getattr(self, 'changed_tables', None)
+        for table in tables:
+            if table.name.replace(".", "__") in pushed_keys:
+                table.indexed_fingerprint = table.fingerprint
+                if changed_tables is not None:
+                    changed_tables.discard(table.name)
+        self.logger.info(f"Pushed {len(summary['succeeded'])} tables to the index.")
+        for key, error in summary["failed"].items():
+            self.logger.error(f"Error pushing data for table {key} to the index: {error}")
+        return summary
+
+    @staticmethod
+    def _make_upload_batches(documents: list, max_batch_documents: int, max_batch_bytes: int) -> list:
+        batches = []
+        current, current_bytes = [], 0
+        for document in documents:
+            size = len(json.dumps(document, default=str).encode("utf-8"))
+            if current and (len(current) >= max_batch_documents or current_bytes + size > max_batch_bytes):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(document)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+
+    def _upload_batch_with_retry(self, search_client, batch: list, max_retries: int, retry_backoff: float):
+        """Uploads a batch and retries only the documents that failed. Returns (succeeded keys, failed keys with errors)."""
+        pending = {document['name_key']: document for document in batch}
+        succeeded, errors = [], {}
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(retry_backoff * 2 ** (attempt - 1))
             try:
-                search_client.upload_documents(documents=[table])
-                self.logger.info(f"Data for table {table['name']} pushed to the index.")
+                results = search_client.upload_documents(documents=list(pending.values()))
             except Exception as e:
-                self.logger.error(f"Error pushing data for table {table['name']} to the index.")
+                errors = {key: str(e) for key in pending}
+                self.logger.warning(f"Upload of {len(pending)} documents failed (attempt {attempt + 1}): {e}")
+                continue
+
+            errors = {}
+            for result in results:
+                if result.succeeded:
+                    succeeded.append(result.key)
+                    pending.pop(result.key, None)
+                else:
+                    errors[result.key] = f"{result.status_code}: {result.error_message}"
+            # keys missing from the response are retried as well
+            for key in pending:
+                errors.setdefault(key, "No result returned for document")
+            if not pending:
                 break
+            self.logger.warning(f"{len(pending)} documents failed to upload (attempt {attempt + 1}), retrying.")
+        return succeeded, {key: errors.get(key) for key in pending}
@@ -0,0 +1,112 @@
+import base64
+import json
+import os
+import struct
+from typing import Iterable, Iterator, List
+
+from sqltoolkit.entities import Table
+
+EMBEDDING_FORMATS = {'float32': 'f', 'float16': 'e'}
+
+
+def encode_embedding(embedding: List[float], dtype: str = 'float32') -> dict:
+    """Packs an embedding into little-endian float32/float16 bytes, base64 encoded."""
+    if dtype not in EMBEDDING_FORMATS:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    data = struct.pack(f'<{len(embedding)}{EMBEDDING_FORMATS[dtype]}', *embedding)
+    return {'dtype': dtype, 'data': base64.b64encode(data).decode('ascii')}
+
+
+def decode_embedding(encoded) -> List[float]:
+    """Reverses `encode_embedding`. Plain lists (and None) are returned unchanged."""
+    if not isinstance(encoded, dict):
+        return encoded
+    code = EMBEDDING_FORMATS[encoded['dtype']]
+    data = base64.b64decode(encoded['data'])
+    return list(struct.unpack(f'<{len(data) // struct.calcsize(code)}{code}', data))
+
+
+def index_path(path: str) -> str:
+    return path + '.index.json'
+
+
+def write_ndjson_manifest(tables: Iterable[Table], path: str, embedding_dtype: str = 'float32') -> dict:
+    """
+    Streams the tables to `path` as NDJSON (one compact JSON table per line) and writes
+    a `<path>.index.json` file mapping each table name to its byte offset and length.
+    Embeddings are stored as base64 float32/float16 unless `embedding_dtype` is None.
+    Returns the offset index.
+    """
+    index = {}
+    with open(path, 'wb') as f:
+        for table in tables:
+            record = table.model_dump() if isinstance(table, Table) else dict(table)
+            if embedding_dtype and record.get('embedding') is not None:
+                record['embedding'] = encode_embedding(record['embedding'], embedding_dtype)
+            line = (json.dumps(record, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+            index[record['name']] = [f.tell(), len(line)]
+            f.write(line)
+
+    with open(index_path(path), 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+class ManifestReader:
+    """
+    Lazily reads an NDJSON manifest written by `write_ndjson_manifest`.
+    A single table can be loaded by name without parsing the rest of the file.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(index_path(path)):
+            with open(index_path(path)) as f:
+                self.index = {name: tuple(entry) for name, entry in json.load(f).items()}
+        else:
+            self.index = self._build_index()
+
+    def _build_index(self) -> dict:
+        index = {}
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    # only the name is needed, but the line must be parsed to find it
+                    index[json.loads(line)['name']] = (offset, len(line))
+                offset += len(line)
+        return index
+
+    def table_names(self) -> List[str]:
+        return list(self.index)
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get_table_dict(self, table_name: str) -> dict:
+        """Returns the raw manifest record of a table, with its embedding decoded."""
+        if table_name not in self.index:
+            raise KeyError(f"Table {table_name} not found in manifest {self.path}.")
+        offset, length = self.index[table_name]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            record = json.loads(f.read(length))
+        record['embedding'] = decode_embedding(record.get('embedding'))
+        return record
+
+    def get_table(self, table_name: str) -> Table:
+        return Table(**self.get_table_dict(table_name))
+
+    def __iter__(self) -> Iterator[Table]:
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    record['embedding'] = decode_embedding(record.get('embedding'))
+                    yield Table(**record)
+
+    def to_dict(self) -> dict:
+        """Returns the manifest in the `{"tables": [...]}` format of `export_json_manifest`."""
+        return {"tables": [table.model_dump() for table in self]}
@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections created through a connector's `get_conn()`.
+
+    Works with every connector in `sqltoolkit.connectors`:
+      - at most `max_size` connections are open at once, callers wait for a free one
+        (up to `checkout_timeout` seconds, forever if None)
+      - `min_size` connections are opened eagerly and kept open
+      - connections idle for more than `health_check_interval` seconds are checked with
+        `SELECT 1` on checkout and transparently replaced if broken
+      - connections idle for more than `idle_timeout` seconds are closed, down to `min_size`
+      - connections not in autocommit mode are rolled back when returned, so no transaction
+        (and the locks it holds) stays open while they sit idle; commit writes before releasing.
+        The mode is read from the connector's `is_autocommit(conn)` when it defines one,
+        otherwise from the DB-API `autocommit` attribute of the connection
+    """
+    def __init__(self, connector, min_size: int = 1, max_size: int = 5, idle_timeout: float = 300.0,
+                 health_check_interval: float = 30.0, checkout_timeout: float = None):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+        self.connector = connector
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(min_size):
+            self._idle.append((self.connector.get_conn(), time.monotonic()))
+            self._size += 1
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out."""
+        return self._size
+
+    def acquire(self):
+        """Checks out a healthy connection, opening a new one if needed."""
+        deadline = None if self.checkout_timeout is None else time.monotonic() + self.checkout_timeout
+        while True:
+            conn, last_used = self._checkout(deadline)
+            if conn is None:
+                try:
+                    return self.connector.get_conn()
+                except Exception:
+                    self._discard()
+                    raise
+            if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(conn):
+                return conn
+            self._close(conn)
+            self._discard()
+
+    def release(self, conn, broken: bool = False) -> None:
+        """Returns a connection to the pool, or closes it if it is broken, cannot be rolled back, or the pool is closed."""
+        if not broken and not self._closed and not self._is_autocommit(conn):
+            broken = not self._rollback(conn)
+        if broken or self._closed:
+            self._close(conn)
+            self._discard()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._evict_idle()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager checking out a connection and returning it afterwards.
+        If the block raises, the connection is rolled back, and discarded if that fails."""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = not self._rollback(conn)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def close(self) -> None:
+        """Closes every idle connection; connections still checked out are closed on release."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._close(conn)
+                self._size -= 1
+            self._cond.notify_all()
+
+    def _checkout(self, deadline):
+        """Returns an idle (connection, last_used) pair, or (None, None) once a slot for a new connection is reserved."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                self._evict_idle()
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise RuntimeError(f"Timed out waiting for a database connection (pool size {self.max_size}).")
+                self._cond.wait(remaining)
+
+    def _evict_idle(self) -> None:
+        # called with the lock held; the oldest idle connections sit at the left of the deque
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._close(conn)
+            self._size -= 1
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_healthy(conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _is_autocommit(self, conn) -> bool:
+        is_autocommit = getattr(self.connector, 'is_autocommit', None)
+        if is_autocommit is not None:
+            return is_autocommit(conn)
+        return getattr(conn, 'autocommit', False) is True
+
+    @staticmethod
+    def _rollback(conn) -> bool:
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -42,4 +42,25 @@ The table name is {table_name}.
 - Business Readable Name: "Customer Information"  
 ===Table Schema  
 {table_json}  
-"""  
\ No newline at end of file
+"""  
+COLUMN_DEFINITIONS_BATCH_PROMPT = """  
+You are an expert in SQL Entity analysis. You must generate a brief definition for each of the SQL Columns listed below. These definitions will be used to generate a SQL query with the correct values. Make sure to include a definition of the data contained in each column.  
+- Each definition should be a brief summary of the column as a whole. 
+- Each definition should be 3-5 sentences long. 
+- Apply NO formatting to the definitions. 
+- Each definition should be in plain text without line breaks or special characters.
+- A definition should not contain the table name or column name.
+
+## Please use this additional context about the database provided to help make the business readable name more accurate: 
+# {extra_context}  
+
+You will use these definitions later to generate a SQL query. Make sure they will be useful for this purpose in determining the values that should be used in the query and any filtering that should be applied. Do not include column values in the descriptions  
+
+You must return a json object mapping every column name to its definition with the following format:
+{{
+    "column1": "definition of column1",
+    "column2": "definition of column2"
+}}
+### Columns to summarize: {column_names}  
+### Table Schema: {table_json}  
+"""  
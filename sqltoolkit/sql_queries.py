@@ -1,5 +1,58 @@
 from typing import Dict
 
+
+def _table_filter(expression: str, table_names: list = None) -> str:
+    """Returns an IN predicate restricting `expression` to the given table names, or an always true predicate."""
+    if not table_names:
+        return "1 = 1"
+    values = ", ".join("'" + str(name).replace("'", "''") + "'" for name in table_names)
+    return f"{expression} IN ({values})"
+
+
+def _union_column_values(column_names: list, column_query, quote, text_type: str, column_types: dict = None,
+                          to_text=None) -> str:
+    """
+    Combines one distinct-values subquery per column into a single UNION ALL statement
+    returning (column_name, value, position) rows. Values are cast to `text_type` so columns
+    of different types can share the result set, while `position` keeps their native order.
+    `to_text(column, column_type)` can override the cast for types whose default text form
+    loses information; `column_types` maps column names to their database types.
+    """
+    column_types = column_types or {}
+    subqueries = []
+    for i, column_name in enumerate(column_names):
+        literal = "'" + column_name.replace("'", "''") + "'"
+        column = quote(column_name)
+        text = to_text(column, column_types.get(column_name)) if to_text else None
+        text = text or f"CAST({column} AS {text_type})"
+        subqueries.append(
+            f"SELECT {literal} AS column_name, {text} AS value, "
+            f"ROW_NUMBER() OVER (ORDER BY {column}) AS position "
+            f"FROM ({column_query(column_name)}) AS s{i}"
+        )
+    return "\nUNION ALL\n".join(subqueries)
+
+# SQL Server CONVERT styles keeping full precision: ODBC canonical dates (yyyy-mm-dd hh:mi:ss.mmm)
+# and 17 significant digits for floats, instead of the `Jan  1 2020 12:00AM` / 6 digit defaults of CAST
+SQLSERVER_TEXT_STYLES = {
+    'date': 121, 'datetime': 121, 'datetime2': 121, 'smalldatetime': 121, 'datetimeoffset': 121, 'time': 121,
+    'float': 3, 'real': 3,
+}
+
+
+def _sqlserver_to_text(column: str, column_type: str = None) -> str:
+    style = SQLSERVER_TEXT_STYLES.get((column_type or '').split('(')[0].strip().lower())
+    return f"CONVERT(NVARCHAR(4000), {column}, {style})" if style is not None else None
+
+SAMPLE_SEED = 42
+
+
+def _sample(clause: str, sample_percent: float = None) -> str:
+    """Returns the dialect sampling clause for `sample_percent` percent of the table, or an empty string."""
+    if sample_percent is None:
+        return ""
+    return " " + clause.format(percent=f"{sample_percent:.6f}", seed=SAMPLE_SEED)
+
 # Define queries for Azure SQL Server
 AZURE_SQL_QUERIES = {
     'list_database_tables': "SELECT TABLE_SCHEMA + '.' + TABLE_NAME AS TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'",
@@ -45,13 +98,75 @@ AZURE_SQL_QUERIES = {
     ORDER BY
         c.TABLE_NAME, c.ORDINAL_POSITION; """,
 
+    'get_all_table_schemas': lambda table_names=None: f"""
+    SELECT  
+        c.TABLE_SCHEMA + '.' + c.TABLE_NAME AS table_name,  
+        c.COLUMN_NAME as name,  
+        c.DATA_TYPE as type,  
+        c.IS_NULLABLE as is_nullable,  
+        CAST(ep.value AS VARCHAR) AS column_description,  
+        CASE  
+            WHEN tc.CONSTRAINT_TYPE = 'PRIMARY KEY' THEN 'PRIMARY KEY'  
+            WHEN tc.CONSTRAINT_TYPE = 'FOREIGN KEY' THEN 'FOREIGN KEY'  
+            ELSE NULL  
+        END AS key_type,  
+        fk.referenced_table_name AS foreign_table,  
+        fk.referenced_column_name AS foreign_column  
+    FROM
+        INFORMATION_SCHEMA.COLUMNS c
+    LEFT JOIN
+        sys.columns sc ON sc.object_id = OBJECT_ID(QUOTENAME(c.TABLE_SCHEMA) + '.' + QUOTENAME(c.TABLE_NAME)) AND sc.name = c.COLUMN_NAME
+    LEFT JOIN
+        sys.extended_properties ep ON ep.major_id = sc.object_id AND ep.minor_id = sc.column_id AND ep.name = 'MS_Description'
+    LEFT JOIN
+        INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu ON c.TABLE_SCHEMA = kcu.TABLE_SCHEMA AND c.TABLE_NAME = kcu.TABLE_NAME AND c.COLUMN_NAME = kcu.COLUMN_NAME
+    LEFT JOIN
+        INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc ON tc.TABLE_SCHEMA = kcu.TABLE_SCHEMA AND tc.TABLE_NAME = kcu.TABLE_NAME AND tc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
+    LEFT JOIN
+        (SELECT
+            fkc.parent_column_id,
+            fk.parent_object_id,
+            fk.name AS constraint_name,
+            fk.referenced_object_id,
+            OBJECT_NAME(fk.referenced_object_id) AS referenced_table_name,
+            COL_NAME(fkc.referenced_object_id, fkc.referenced_column_id) AS referenced_column_name
+        FROM
+            sys.foreign_keys fk
+        INNER JOIN
+            sys.foreign_key_columns fkc ON fk.object_id = fkc.constraint_object_id) fk
+    ON fk.parent_object_id = sc.object_id AND fk.parent_column_id = sc.column_id
+    WHERE
+        {_table_filter("c.TABLE_SCHEMA + '.' + c.TABLE_NAME", table_names)}
+    ORDER BY
+        c.TABLE_SCHEMA, c.TABLE_NAME, c.ORDINAL_POSITION; """,
+
     'get_table_rows': lambda table_name: f"SELECT TOP 3 * FROM {table_name}",
 
-    'get_column_values': lambda table_name, column_name: f"""
+    'get_column_values': lambda table_name, column_name, sample_percent=None: f"""
     SELECT DISTINCT TOP 10 
         {column_name} 
-    FROM {table_name} 
-    ORDER BY {column_name}"""
+    FROM {table_name}{_sample("TABLESAMPLE ({percent} PERCENT) REPEATABLE ({seed})", sample_percent)} 
+    ORDER BY {column_name}""",
+
+    'get_table_column_values': lambda table_name, column_names, sample_percent=None, column_types=None: _union_column_values(
+        column_names,
+        lambda column_name: f"SELECT DISTINCT TOP 10 {column_name} FROM {table_name}"
+                            f"{_sample('TABLESAMPLE ({percent} PERCENT) REPEATABLE ({seed})', sample_percent)} ORDER BY {column_name}",
+        lambda column_name: column_name,
+        'NVARCHAR(4000)',
+        column_types,
+        _sqlserver_to_text
+    ),
+
+    'get_table_row_count': lambda table_name: f"""
+    SELECT SUM(p.rows) AS row_count
+    FROM sys.partitions p
+    WHERE p.object_id = OBJECT_ID('{table_name}') AND p.index_id IN (0, 1)""",
+
+    # SHOWPLAN_XML must be enabled in its own batch, the query is then compiled but not executed
+    'explain_enable': "SET SHOWPLAN_XML ON",
+    'explain_query': lambda query: query,
+    'explain_disable': "SET SHOWPLAN_XML OFF"
 }
 
 # Define queries for PostgreSQL
@@ -100,14 +215,65 @@ WHERE
 ORDER BY  
     cols.ordinal_position;  """,
 
+    'get_all_table_schemas': lambda table_names=None: f"""SELECT  
+    cols.table_schema || '.' || cols.table_name AS table_name,  
+    cols.column_name AS name,  
+    cols.data_type AS type,  
+    cols.is_nullable,  
+    col_description((quote_ident(cols.table_schema) || '.' || quote_ident(cols.table_name))::regclass, cols.ordinal_position) AS column_description,  
+    CASE  
+        WHEN tc.constraint_type = 'PRIMARY KEY' THEN 'PRIMARY KEY'  
+        WHEN tc.constraint_type = 'FOREIGN KEY' THEN 'FOREIGN KEY'  
+        ELSE NULL  
+    END AS key_type,  
+    ccu.table_name AS foreign_table,  
+    ccu.column_name AS foreign_column  
+FROM  
+    information_schema.columns AS cols  
+    JOIN information_schema.tables AS t  
+        ON cols.table_schema = t.table_schema  
+        AND cols.table_name = t.table_name  
+        AND t.table_type = 'BASE TABLE'  
+    LEFT JOIN information_schema.key_column_usage AS kcu  
+        ON cols.table_name = kcu.table_name  
+        AND cols.column_name = kcu.column_name  
+        AND cols.table_schema = kcu.table_schema  
+    LEFT JOIN information_schema.table_constraints AS tc  
+        ON kcu.constraint_name = tc.constraint_name  
+        AND kcu.table_schema = tc.table_schema  
+    LEFT JOIN information_schema.constraint_column_usage AS ccu  
+        ON tc.constraint_name = ccu.constraint_name  
+        AND tc.table_schema = ccu.table_schema  
+WHERE  
+    cols.table_schema NOT IN ('pg_catalog', 'information_schema')
+    AND {_table_filter("cols.table_schema || '.' || cols.table_name", table_names)}
+ORDER BY  
+    cols.table_schema, cols.table_name, cols.ordinal_position;  """,
+
     'get_table_rows': lambda table_name: f"SELECT * FROM {table_name} LIMIT 3",
 
-    'get_column_values': lambda table_name, column_name: f"""
+    'get_column_values': lambda table_name, column_name, sample_percent=None: f"""
     SELECT DISTINCT 
         "{column_name}"
-    FROM {table_name}
+    FROM {table_name}{_sample("TABLESAMPLE SYSTEM ({percent}) REPEATABLE ({seed})", sample_percent)}
     ORDER BY "{column_name}"
-    LIMIT 10"""
+    LIMIT 10""",
+
+    'get_table_column_values': lambda table_name, column_names, sample_percent=None, column_types=None: _union_column_values(
+        column_names,
+        lambda column_name: f'SELECT DISTINCT "{column_name}" FROM {table_name}'
+                            f'{_sample("TABLESAMPLE SYSTEM ({percent}) REPEATABLE ({seed})", sample_percent)} ORDER BY "{column_name}" LIMIT 10',
+        lambda column_name: f'"{column_name}"',
+        'TEXT',
+        column_types
+    ),
+
+    'get_table_row_count': lambda table_name: f"""
+    SELECT reltuples::bigint AS row_count
+    FROM pg_class
+    WHERE oid = '{table_name}'::regclass""",
+
+    'explain_query': lambda query: f"EXPLAIN (FORMAT JSON) {query}"
 }
 
 SNOWFLAKE_QUERIES = {
@@ -141,16 +307,158 @@ WHERE
 ORDER BY  
     cols.ORDINAL_POSITION;""",
 
+    'get_all_table_schemas': lambda table_names=None: f"""
+SELECT  
+    cols.TABLE_SCHEMA || '.' || cols.TABLE_NAME AS "table_name",  
+    cols.COLUMN_NAME AS "name",  
+    cols.DATA_TYPE AS "type",  
+    cols.IS_NULLABLE,  
+    cols.COMMENT AS "column_description",  
+    CASE  
+        WHEN pk.CONSTRAINT_TYPE = 'PRIMARY KEY' THEN 'PRIMARY KEY'
+        ELSE NULL
+    END AS "key_type"
+FROM  
+    INFORMATION_SCHEMA.COLUMNS AS cols
+LEFT JOIN (
+    SELECT DISTINCT tc.TABLE_SCHEMA, tc.TABLE_NAME, tc.CONSTRAINT_TYPE
+    FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+    WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+) pk
+    ON cols.TABLE_SCHEMA = pk.TABLE_SCHEMA
+    AND cols.TABLE_NAME = pk.TABLE_NAME
+WHERE  
+    cols.TABLE_SCHEMA NOT IN ('INFORMATION_SCHEMA')
+    AND {_table_filter("cols.TABLE_SCHEMA || '.' || cols.TABLE_NAME", table_names)}
+ORDER BY  
+    cols.TABLE_SCHEMA, cols.TABLE_NAME, cols.ORDINAL_POSITION;""",
+
     'get_table_rows': lambda table_name: f"SELECT * FROM {table_name} LIMIT 3",
 
-    'get_column_values': lambda table_name, column_name: f"""
+    'get_column_values': lambda table_name, column_name, sample_percent=None: f"""
 SELECT DISTINCT 
     "{column_name}"
-FROM {table_name}
+FROM {table_name}{_sample("SAMPLE SYSTEM ({percent}) SEED ({seed})", sample_percent)}
 ORDER BY "{column_name}"
-LIMIT 10"""
+LIMIT 10""",
+
+    'get_table_column_values': lambda table_name, column_names, sample_percent=None, column_types=None: _union_column_values(
+        column_names,
+        lambda column_name: f'SELECT DISTINCT "{column_name}" FROM {table_name}'
+                            f'{_sample("SAMPLE SYSTEM ({percent}) SEED ({seed})", sample_percent)} ORDER BY "{column_name}" LIMIT 10',
+        lambda column_name: f'"{column_name}"',
+        'VARCHAR',
+        column_types
+    ),
+
+    'get_table_row_count': lambda table_name: f"""
+SELECT ROW_COUNT AS "row_count"
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA || '.' || TABLE_NAME = '{table_name}'""",
+
+    'explain_query': lambda query: f"EXPLAIN USING JSON {query}"
 }
 
+def _sqlite_table(table_name: str) -> tuple:
+    """Splits a `schema.table` name into (table, schema) string literals for the SQLite pragma functions."""
+    schema, _, name = table_name.rpartition('.')
+    return tuple("'" + part.replace("'", "''") + "'" for part in (name, schema or 'main'))
+
+# Define queries for SQLite (local files and in-memory databases). Column descriptions are
+# read from the `sqltoolkit_column_descriptions` table maintained by `SQLiteConnector`.
+# SQLite has no table sampling, so `sample_percent` is ignored and row counts are exact.
+SQLITE_QUERIES = {
+    'list_database_tables': """SELECT 'main.' || name AS TABLE_NAME
+FROM sqlite_master
+WHERE type = 'table'
+    AND name NOT LIKE 'sqlite_%'
+    AND name <> 'sqltoolkit_column_descriptions'
+ORDER BY name""",
+
+    'get_table_schema': lambda table_name: f"""SELECT
+    cols.name,
+    cols.type,
+    CASE WHEN cols."notnull" THEN 'NO' ELSE 'YES' END AS is_nullable,
+    descriptions.description AS column_description,
+    CASE
+        WHEN cols.pk > 0 THEN 'PRIMARY KEY'
+        WHEN fk."table" IS NOT NULL THEN 'FOREIGN KEY'
+        ELSE NULL
+    END AS key_type,
+    fk."table" AS foreign_table,
+    fk."to" AS foreign_column
+FROM
+    pragma_table_info({', '.join(_sqlite_table(table_name))}) AS cols
+    LEFT JOIN pragma_foreign_key_list({', '.join(_sqlite_table(table_name))}) AS fk
+        ON fk."from" = cols.name
+    LEFT JOIN sqltoolkit_column_descriptions AS descriptions
+        ON descriptions.table_name = {_sqlite_table(table_name)[0]}
+        AND descriptions.column_name = cols.name
+ORDER BY
+    cols.cid""",
+
+    'get_all_table_schemas': lambda table_names=None: f"""SELECT
+    'main.' || tables.name AS table_name,
+    cols.name,
+    cols.type,
+    CASE WHEN cols."notnull" THEN 'NO' ELSE 'YES' END AS is_nullable,
+    descriptions.description AS column_description,
+    CASE
+        WHEN cols.pk > 0 THEN 'PRIMARY KEY'
+        WHEN fk."table" IS NOT NULL THEN 'FOREIGN KEY'
+        ELSE NULL
+    END AS key_type,
+    fk."table" AS foreign_table,
+    fk."to" AS foreign_column
+FROM
+    sqlite_master AS tables
+    JOIN pragma_table_info(tables.name) AS cols
+    LEFT JOIN pragma_foreign_key_list(tables.name) AS fk
+        ON fk."from" = cols.name
+    LEFT JOIN sqltoolkit_column_descriptions AS descriptions
+        ON descriptions.table_name = tables.name
+        AND descriptions.column_name = cols.name
+WHERE
+    tables.type = 'table'
+    AND tables.name NOT LIKE 'sqlite_%'
+    AND tables.name <> 'sqltoolkit_column_descriptions'
+    AND {_table_filter("'main.' || tables.name", table_names)}
+ORDER BY
+    tables.name, cols.cid""",
+
+    'get_table_rows': lambda table_name: f"SELECT * FROM {table_name} LIMIT 3",
+
+    'get_column_values': lambda table_name, column_name, sample_percent=None: f"""
+    SELECT DISTINCT
+        "{column_name}"
+    FROM {table_name}
+    ORDER BY "{column_name}"
+    LIMIT 10""",
+
+    'get_table_column_values': lambda table_name, column_names, sample_percent=None, column_types=None: _union_column_values(
+        column_names,
+        lambda column_name: f'SELECT DISTINCT "{column_name}" FROM {table_name} ORDER BY "{column_name}" LIMIT 10',
+        lambda column_name: f'"{column_name}"',
+        'TEXT',
+        column_types
+    ),
+
+    'get_table_row_count': lambda table_name: f"SELECT COUNT(*) AS row_count FROM {table_name}"
+}
+
+# sqlglot dialect of each database type
+SQLGLOT_DIALECTS = {
+    'AZURE_SQL': 'tsql',
+    'POSTGRESQL': 'postgres',
+    'SNOWFLAKE': 'snowflake',
+    'SQLITE': 'sqlite',
+}
+
+
+def get_sqlglot_dialect(db_type: str) -> str:
+    """Returns the sqlglot dialect name for a database type, or None for generic SQL."""
+    return SQLGLOT_DIALECTS.get(db_type)
+
 # Function to get the appropriate query based on database type and query name
 def get_query(db_type: str, query_name: str, **kwargs) -> str:
     if db_type == 'AZURE_SQL':
@@ -159,6 +467,8 @@ def get_query(db_type: str, query_name: str, **kwargs) -> str:
         queries = POSTGRESQL_QUERIES
     elif db_type == 'SNOWFLAKE':
         queries = SNOWFLAKE_QUERIES
+    elif db_type == 'SQLITE':
+        queries = SQLITE_QUERIES
     else:
         raise ValueError(f"Unsupported database type: {db_type}")
 
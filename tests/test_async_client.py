@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+import decimal
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from sqltoolkit.async_client import AsyncDatabaseClient
+from sqltoolkit.cache import MemoryCache
+from sqltoolkit.client import get_tools_manifest
+from sqltoolkit.connectors import SQLiteConnector
+
+
+class FakeAsyncCursor:
+    def __init__(self, pool):
+        self.pool = pool
+        self.description = None
+        self.rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def execute(self, query):
+        self.pool.executed.append(query)
+        columns, self.rows = self.pool.results(query)
+        self.description = [SimpleNamespace(name=column) for column in columns]
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeAsyncPool:
+    """Stands in for psycopg_pool.AsyncConnectionPool, answering every query with `results(query)`."""
+    results = None
+
+    def __init__(self, conninfo, **kwargs):
+        self.executed = []
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @asynccontextmanager
+    async def connection(self):
+        yield SimpleNamespace(cursor=lambda: FakeAsyncCursor(self))
+
+
+def native_client(monkeypatch, results, **kwargs):
+    monkeypatch.setattr('sqltoolkit.async_client.AsyncConnectionPool', FakeAsyncPool)
+    monkeypatch.setattr(FakeAsyncPool, 'results', staticmethod(results))
+    connector = SimpleNamespace(type='POSTGRESQL', connection_string='postgresql://fake')
+    client = AsyncDatabaseClient(connector, **kwargs)
+    assert client.native
+    return client
+
+
+def test_native_query_returns_numbers_and_formatted_dates(monkeypatch):
+    rows = [(decimal.Decimal('1.50'), datetime.date(2020, 1, 1)), (decimal.Decimal('2'), datetime.date(2020, 1, 2))]
+    client = native_client(monkeypatch, lambda query: (['amount', 'day'], rows))
+
+    result = asyncio.run(client.query("SELECT amount, day FROM t"))
+
+    assert json.loads(result) == [{'amount': 1.5, 'day': '2020-01-01'}, {'amount': 2.0, 'day': '2020-01-02'}]
+
+
+def test_native_query_applies_the_cost_gate(monkeypatch):
+    plan = [{'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 5000000, 'Total Cost': 100000.0}}]
+
+    def results(query):
+        return (['QUERY PLAN'], [(plan,)]) if query.startswith('EXPLAIN') else (['a'], [(1,)])
+
+    client = native_client(monkeypatch, results, max_estimated_rows=1000)
+
+    with pytest.raises(ValueError, match="Query rejected before execution: estimated rows 5,000,000"):
+        asyncio.run(client.query("SELECT a FROM t"))
+    assert not any(query == "SELECT a FROM t" for query in client._pool.executed)
+
+
+def test_native_query_uses_the_result_cache(monkeypatch):
+    client = native_client(monkeypatch, lambda query: (['a'], [(1,)]), result_cache=MemoryCache())
+
+    async def run_twice():
+        return await client.query("SELECT a FROM t"), await client.query("select a  from t")
+
+    assert asyncio.run(run_twice()) == ('[{"a": 1}]', '[{"a": 1}]')
+    assert client._pool.executed == ["SELECT a FROM t"]
+    assert client.result_cache.stats()['hits'] == 1
+
+
+def test_executor_query_uses_the_result_cache():
+    connector = SQLiteConnector(':memory:')
+    connector._keepalive.execute("CREATE TABLE t (a INTEGER)")
+    connector._keepalive.execute("INSERT INTO t VALUES (1)")
+    connector._keepalive.commit()
+
+    async def run_twice():
+        async with AsyncDatabaseClient(connector, result_cache=MemoryCache(), native=False) as client:
+            return await client.query("SELECT a FROM t"), await client.query("SELECT a FROM t"), client.result_cache.stats()
+
+    first, second, stats = asyncio.run(run_twice())
+
+    assert json.loads(first) == json.loads(second) == [{'a': 1}]
+    assert stats['hits'] == 1
+
+
+def test_tools_manifest_matches_the_sync_client():
+    client = AsyncDatabaseClient(SQLiteConnector(':memory:'), native=False)
+
+    assert client.get_tools_manifest() == get_tools_manifest()
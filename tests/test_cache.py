@@ -0,0 +1,63 @@
+import pytest
+
+from sqltoolkit.cache import MemoryCache, SQLiteCache
+from sqltoolkit.client import DatabaseClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('sqltoolkit.cache.time.time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make_cache(**options):
+        if request.param == 'memory':
+            return MemoryCache(**options)
+        return SQLiteCache(str(tmp_path / 'cache.sqlite'), **options)
+    return make_cache
+
+
+def test_entries_expire_after_their_ttl(make_cache, clock):
+    cache = make_cache(ttl=10)
+    cache.set('default', 'a')
+    cache.set('longer', 'b', ttl=60)
+
+    clock.now += 30
+
+    assert cache.get('default') is None
+    assert cache.get('longer') == 'b'
+    assert cache.stats()['hits'] == 1
+
+
+def test_least_recently_used_entries_are_evicted_first(make_cache, clock):
+    cache = make_cache(max_size_bytes=3)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key)
+        clock.now += 1
+    assert cache.get('a') == 'a'
+    clock.now += 1
+
+    cache.set('d', 'd')
+
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in ('a', 'c', 'd')] == ['a', 'c', 'd']
+    assert cache.stats()['size_bytes'] == 3
+
+
+def test_unparseable_queries_keep_whitespace_inside_literals():
+    first = DatabaseClient.normalize_query("SELEC * FROM t WHERE b = 'x  y'", 'postgres')
+    second = DatabaseClient.normalize_query("SELEC * FROM t WHERE b = 'x y'", 'postgres')
+
+    assert first != second
+    assert DatabaseClient.normalize_query("  SELECT a FROM t ", 'postgres') == DatabaseClient.normalize_query("select a\nfrom t", 'postgres')
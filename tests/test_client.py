@@ -0,0 +1,218 @@
+import datetime
+import decimal
+import json
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from sqltoolkit.client import DatabaseClient
+
+pa = pytest.importorskip("pyarrow")
+
+
+class SQLiteMemoryConnector:
+    type = 'ODBC'
+    connection_string = 'sqlite-memory'
+
+    def __init__(self, statements=()):
+        self.statements = statements
+
+    def get_conn(self):
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        for statement in self.statements:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+
+class FakeCursor:
+    def __init__(self, connection, columns, rows):
+        self.connection = connection
+        self.description = [(column,) for column in columns]
+        self.rows = list(rows)
+
+    def execute(self, query):
+        self.connection.executed.append(query)
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.executed = []
+
+    def cursor(self, name=None):
+        return FakeCursor(self, self.columns, self.rows)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeConnector:
+    connection_string = 'fake'
+
+    def __init__(self, columns, rows, type='ODBC'):
+        self.columns = columns
+        self.rows = rows
+        self.type = type
+        self.connections = []
+
+    def get_conn(self):
+        self.connections.append(FakeConnection(self.columns, self.rows))
+        return self.connections[-1]
+
+
+def test_query_falls_back_to_pandas_for_mixed_type_columns():
+    connector = SQLiteMemoryConnector([
+        "CREATE TABLE t (value)",
+        "INSERT INTO t VALUES ('text'), (1)",
+    ])
+    client = DatabaseClient(connector)
+
+    assert json.loads(client.query("SELECT value FROM t")) == [{'value': 'text'}, {'value': 1}]
+
+
+def test_mixed_type_columns_are_read_once():
+    connector = FakeConnector(['value'], [('text',), (1,)])
+    client = DatabaseClient(connector)
+
+    assert json.loads(client.query("SELECT value FROM t")) == [{'value': 'text'}, {'value': 1}]
+    assert [query for connection in connector.connections for query in connection.executed] == ["SELECT value FROM t"]
+
+
+def test_arrow_and_pandas_paths_format_temporal_values_alike(monkeypatch):
+    utc_plus_2 = datetime.timezone(datetime.timedelta(hours=2))
+    rows = [
+        (datetime.datetime(2020, 1, 1, 10, tzinfo=utc_plus_2), datetime.datetime(2020, 1, 1, 10), datetime.date(2020, 1, 1),
+         datetime.time(1, 2, 3), decimal.Decimal('1.50'), 'a'),
+        (datetime.datetime(2020, 1, 2, 8, 30, tzinfo=utc_plus_2), datetime.datetime(2020, 1, 2, 8, 30, 15), datetime.date(2020, 1, 2),
+         datetime.time(23, 59), decimal.Decimal('2'), 'b'),
+    ]
+    client = DatabaseClient(FakeConnector(['created_tz', 'created', 'day', 'at', 'amount', 'label'], rows, type='POSTGRESQL'))
+
+    arrow_result = client.query("SELECT * FROM t")
+    monkeypatch.setattr('sqltoolkit.client.pa', None)
+    pandas_result = client.query("SELECT * FROM t")
+
+    assert json.loads(arrow_result) == json.loads(pandas_result)
+    assert json.loads(arrow_result)[0] == {'created_tz': '2020-01-01 10:00:00+02:00', 'created': '2020-01-01 10:00:00',
+                                           'day': '2020-01-01', 'at': '01:02:03', 'amount': 1.5, 'label': 'a'}
+
+
+def test_query_arrow_widens_types_across_batches():
+    rows = [(decimal.Decimal('1.5'), 1), (decimal.Decimal('123.456'), 2.5)]
+    client = DatabaseClient(FakeConnector(['amount', 'mixed'], rows))
+
+    table = client.query_arrow("SELECT amount, mixed FROM t", batch_size=1)
+
+    assert table.schema.field('amount').type == pa.decimal128(6, 3)
+    assert table.schema.field('mixed').type == pa.float64()
+    assert json.loads(client.query("SELECT amount, mixed FROM t")) == [
+        {'amount': 1.5, 'mixed': 1.0}, {'amount': 123.456, 'mixed': 2.5}
+    ]
+
+
+def test_datetime_columns_are_rechecked_after_an_all_null_result():
+    empty = pd.DataFrame({'id': [1], 'shape_check_day': pd.Series([None], dtype=object)})
+    assert DatabaseClient.convert_datetime_columns_to_string(empty, cache_key='q')['shape_check_day'].tolist() == [None]
+
+    dates = pd.DataFrame({'id': [2], 'shape_check_day': pd.Series([datetime.date(2020, 1, 1)], dtype=object)})
+    converted = DatabaseClient.convert_datetime_columns_to_string(dates, cache_key='q')
+
+    assert json.dumps(converted.to_dict(orient='records')) == '[{"id": 2, "shape_check_day": "2020-01-01"}]'
+
+
+def test_table_column_values_are_returned_as_native_types():
+    class SQLiteConnector(SQLiteMemoryConnector):
+        type = 'SQLITE'
+
+    connector = SQLiteConnector([
+        "CREATE TABLE t (id INTEGER, amount REAL, flag BOOLEAN, label TEXT, created DATETIME)",
+        "INSERT INTO t VALUES (1, 1.5, 1, 'a', '2020-01-01 00:00:00.000'), (2, 2.0, 0, 'b', '2020-01-02 10:30:00.000')",
+    ])
+    client = DatabaseClient(connector)
+    column_types = {'id': 'INTEGER', 'amount': 'REAL', 'flag': 'BOOLEAN', 'label': 'TEXT', 'created': 'DATETIME'}
+
+    values = json.loads(client.get_table_column_values('main.t', list(column_types), column_types=column_types))
+
+    assert values == {
+        'id': [1, 2],
+        'amount': [1.5, 2.0],
+        'flag': [False, True],
+        'label': ['a', 'b'],
+        'created': ['2020-01-01 00:00:00', '2020-01-02 10:30:00'],
+    }
+
+
+def test_server_side_cursor_results_convert_decimals(monkeypatch):
+    connector = FakeConnector(['amount'], [(decimal.Decimal('1.50'),), (decimal.Decimal('2'),)], type='POSTGRESQL')
+    client = DatabaseClient(connector)
+
+    assert json.loads(client.get_column_values('public.t', 'amount')) == [{'amount': 1.5}, {'amount': 2.0}]
+    monkeypatch.setattr('sqltoolkit.client.pa', None)
+    assert json.loads(client.query("SELECT amount FROM public.t")) == [{'amount': 1.5}, {'amount': 2.0}]
+
+
+def test_datetime_decisions_are_not_shared_between_queries():
+    class SQLiteConnector(SQLiteMemoryConnector):
+        type = 'SQLITE'
+
+    client = DatabaseClient(SQLiteConnector([
+        "CREATE TABLE yearmonth (Date TEXT)",
+        "INSERT INTO yearmonth VALUES ('201201')",
+        "CREATE TABLE transactions_1k (Date DATE)",
+        "INSERT INTO transactions_1k VALUES ('2020-01-01')",
+    ]))
+    # sqlite3 returns text for DATE columns, the date objects (and object dtype) of a real driver are added on read
+    sqlite_read_sql = client._read_sql
+
+    def read_sql(query, timeout=None):
+        df = sqlite_read_sql(query, timeout)
+        df['Date'] = pd.Series([datetime.date.fromisoformat(value) if '-' in value else value for value in df['Date']], dtype=object)
+        return df
+
+    client._read_sql = read_sql
+
+    assert json.loads(client.get_column_values('main.yearmonth', 'Date')) == [{'Date': '201201'}]
+    assert json.loads(client.get_column_values('main.transactions_1k', 'Date')) == [{'Date': '2020-01-01'}]
+
+
+@pytest.mark.parametrize('dialect, query, expected', [
+    ('tsql', "SELECT TOP 5 a FROM t", "SELECT TOP 5 a FROM t"),
+    ('tsql', "SELECT TOP 500 a FROM t", "SELECT TOP 100 a FROM t"),
+    ('tsql', "SELECT a FROM t", "SELECT TOP 100 a FROM t"),
+    ('tsql', "SELECT TOP 10 PERCENT a FROM t", "SELECT TOP 100 * FROM (SELECT TOP 10 PERCENT a AS a FROM t) AS _limited"),
+    ('tsql', "SELECT TOP 5 WITH TIES a FROM t ORDER BY a",
+     "SELECT TOP 100 * FROM (SELECT TOP 5 WITH TIES a AS a FROM t ORDER BY a) AS _limited"),
+    ('tsql', "SELECT a FROM t ORDER BY a OFFSET 0 ROWS FETCH NEXT 500 ROWS ONLY",
+     "SELECT a FROM t ORDER BY a OFFSET 0 ROWS FETCH FIRST 100 ROWS ONLY"),
+    ('tsql', "SELECT a FROM t UNION SELECT a FROM u", "SELECT TOP 100 * FROM (SELECT a FROM t UNION SELECT a FROM u) AS _l_0"),
+    ('postgres', "SELECT a FROM t LIMIT 500", "SELECT a FROM t LIMIT 100"),
+    ('postgres', "SELECT a FROM t FETCH FIRST 5 ROWS ONLY", "SELECT a FROM t FETCH FIRST 5 ROWS ONLY"),
+    ('postgres', "SELECT a FROM t FETCH FIRST 10 PERCENT ROWS ONLY",
+     "SELECT * FROM (SELECT a FROM t FETCH FIRST 10 PERCENT ROWS ONLY) AS _limited LIMIT 100"),
+    ('postgres', "SELECT a FROM t ORDER BY a FETCH FIRST 5 ROWS WITH TIES",
+     "SELECT * FROM (SELECT a FROM t ORDER BY a FETCH FIRST 5 ROWS WITH TIES) AS _limited LIMIT 100"),
+    ('postgres', "SELECT a FROM t UNION SELECT a FROM u", "SELECT a FROM t UNION SELECT a FROM u LIMIT 100"),
+    ('snowflake', "SELECT a FROM t LIMIT 5", "SELECT a FROM t LIMIT 5"),
+    ('snowflake', "SELECT a FROM t UNION ALL SELECT a FROM u", "SELECT a FROM t UNION ALL SELECT a FROM u LIMIT 100"),
+    ('sqlite', "SELECT a FROM t LIMIT 500", "SELECT a FROM t LIMIT 100"),
+])
+def test_limit_query(dialect, query, expected):
+    assert DatabaseClient.limit_query(query, 100, dialect) == expected
+
+
+def test_limit_query_rejects_statements_other_than_select():
+    with pytest.raises(ValueError):
+        DatabaseClient.limit_query("DELETE FROM t", 100, 'postgres')
@@ -0,0 +1,25 @@
+from sqltoolkit.compiler import SQLQueryChecker
+
+REFERENCE_SCHEMA = [
+    {'table': 'public.customers', 'columns': ['CustomerID', 'Segment', 'Currency']},
+    {'table': 'public.yearmonth', 'columns': ['CustomerID', 'Date', 'Consumption']},
+]
+
+
+def test_unknown_qualified_column_is_reported_against_its_table():
+    checker = SQLQueryChecker(None, None, 'Postgres', REFERENCE_SCHEMA)
+
+    assert checker.validate_query('SELECT c."Bogus" FROM customers c') == {
+        'query_valid': False, 'error': 'Column Bogus not found in table public.customers.'}
+    assert checker.validate_query(
+        'SELECT y."Bogus" FROM customers c JOIN yearmonth y ON c."CustomerID" = y."CustomerID"'
+    ) == {'query_valid': False, 'error': 'Column Bogus not found in table public.yearmonth.'}
+    assert checker.validate_query('SELECT c."Segment" FROM customers c') == {'query_valid': True}
+
+
+def test_ambiguous_column_is_reported_as_unresolved():
+    checker = SQLQueryChecker(None, None, 'Postgres', REFERENCE_SCHEMA)
+
+    assert checker.validate_query('SELECT "CustomerID" FROM customers c JOIN yearmonth y ON 1 = 1') == {
+        'query_valid': False,
+        'error': 'Could not resolve column "CustomerID" to a single table of the reference schema.'}
@@ -0,0 +1,43 @@
+import json
+import os
+import sqlite3
+
+from sqltoolkit.client import DatabaseClient
+from sqltoolkit.connectors import SQLiteConnector
+
+DOCUMENTATION_DIR = os.path.join(os.path.dirname(__file__), '..', 'evaluation', 'debit_card_specializing_doc')
+
+
+def test_sqlite_connector_does_not_write_to_an_existing_database(tmp_path):
+    path = str(tmp_path / 'existing.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    os.chmod(path, 0o444)
+
+    client = DatabaseClient(SQLiteConnector(path))
+    schema = json.loads(client.get_table_schema('main.customers'))['Columns']
+    all_schemas = json.loads(client.get_all_table_schemas())
+
+    assert [(column['name'], column['column_description']) for column in schema] == [('id', None), ('name', None)]
+    assert schema[0]['key_type'] == 'PRIMARY KEY'
+    assert list(all_schemas) == ['main.customers']
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT name FROM sqlite_master").fetchall() == [('customers',)]
+    conn.close()
+
+
+def test_sqlite_connector_loads_documentation_csvs():
+    connector = SQLiteConnector()
+    # a pooled connection opened before the descriptions table exists
+    client = DatabaseClient(connector)
+
+    assert connector.load_directory(DOCUMENTATION_DIR) == ['customers', 'gasstations', 'products', 'transactions_1k', 'yearmonth']
+    tables = [table['TABLE_NAME'] for table in json.loads(client.list_database_tables())]
+    schema = json.loads(client.get_table_schema('main.customers'))['Columns']
+
+    assert tables == ['main.customers', 'main.gasstations', 'main.products', 'main.transactions_1k', 'main.yearmonth']
+    assert schema[0]['name'] == 'CustomerID'
+    assert schema[0]['type'] == 'INTEGER'
+    assert schema[0]['column_description'] == 'identification of the customer'
@@ -0,0 +1,13 @@
+import pytest
+
+from sqltoolkit.entities import Table
+
+
+@pytest.mark.parametrize('batch_size', [None, 0, 5])
+def test_column_definitions_of_a_table_without_columns(batch_size):
+    table = Table(name='public.empty', columns=[])
+
+    # no column means no LLM call, the client is never used
+    table.extract_llm_column_definitions(None, 'deployment', '', batch_size=batch_size)
+
+    assert table.columns == []
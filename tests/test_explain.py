@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from sqltoolkit.client import DatabaseClient
+from sqltoolkit.connectors import SQLiteConnector
+from sqltoolkit.explain import check_estimate, parse_postgres_plan, parse_snowflake_plan, parse_sqlserver_plan
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'explain')
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_postgres_plan():
+    assert parse_postgres_plan(read_fixture('postgres_plan.json')) == {
+        'engine': 'POSTGRESQL', 'estimated_rows': 383282.0, 'estimated_cost': 12874.35, 'root_operation': 'Hash Join',
+    }
+
+
+def test_parse_sqlserver_plan():
+    assert parse_sqlserver_plan(read_fixture('sqlserver_showplan.xml')) == {
+        'engine': 'AZURE_SQL', 'estimated_rows': 383282.0, 'estimated_cost': 4.82931,
+    }
+
+
+def test_parse_snowflake_plan():
+    assert parse_snowflake_plan(read_fixture('snowflake_plan.json')) == {
+        'engine': 'SNOWFLAKE', 'estimated_rows': None, 'estimated_cost': 52428800.0,
+        'partitions_total': 48, 'partitions_assigned': 12,
+    }
+
+
+def test_check_estimate():
+    estimate = check_estimate(parse_postgres_plan(read_fixture('postgres_plan.json')), max_estimated_rows=100000)
+
+    assert not estimate['allowed']
+    assert estimate['reason'] == "estimated rows 383,282 exceed the limit of 100,000"
+    assert check_estimate(parse_postgres_plan(read_fixture('postgres_plan.json')), max_estimated_cost=20000)['allowed']
+
+
+@pytest.mark.parametrize('connector_type', ['SQLITE', 'ODBC'])
+def test_cost_thresholds_are_rejected_without_plan_support(connector_type):
+    connector = SQLiteConnector(':memory:')
+    connector.type = connector_type
+
+    with pytest.raises(ValueError, match=f"not supported for {connector_type} connections"):
+        DatabaseClient(connector, max_estimated_rows=1000)
+    with pytest.raises(ValueError, match=f"Query cost estimates are not supported for {connector_type}"):
+        DatabaseClient(connector).check_query_cost("SELECT 1", max_estimated_rows=1000)
@@ -0,0 +1,120 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("azure.search.documents")
+
+from sqltoolkit.entities import Table, TableColumn
+from sqltoolkit.indexer import DatabaseIndexer
+
+
+class FakeSearchClient:
+    """Stands in for the Azure AI Search endpoint. `failures` maps a key to the number of
+    attempts that fail for it, and keys in `missing` are left out of the first response."""
+    def __init__(self, failures=None, missing=()):
+        self.failures = dict(failures or {})
+        self.missing = set(missing)
+        self.calls = []
+
+    def upload_documents(self, documents):
+        keys = [document['name_key'] for document in documents]
+        self.calls.append(keys)
+        results = []
+        for key in keys:
+            if key in self.missing:
+                self.missing.discard(key)
+                continue
+            failed = self.failures.get(key, 0) > 0
+            if failed:
+                self.failures[key] -= 1
+            results.append(SimpleNamespace(key=key, succeeded=not failed,
+                                           status_code=503 if failed else 200,
+                                           error_message="unavailable" if failed else None))
+        return results
+
+
+def make_indexer(table_names):
+    indexer = DatabaseIndexer(client=None, openai_client=None, aoai_deployment=None)
+    indexer.tables = [
+        Table(name=name, description=f"{name} table", fingerprint=f"fp-{name}",
+              columns=[TableColumn(name='id', type='int', sample_values=[1, 2])])
+        for name in table_names
+    ]
+    indexer.changed_tables = set(table_names)
+    return indexer
+
+
+def test_only_successfully_pushed_tables_are_recorded_as_indexed():
+    indexer = make_indexer(['dbo.a', 'dbo.b'])
+
+    summary = indexer.push_to_ai_search(search_client=FakeSearchClient(failures={'dbo__b': 10}),
+                                        max_retries=1, retry_backoff=0)
+
+    assert summary['succeeded'] == ['dbo__a']
+    assert list(summary['failed']) == ['dbo__b']
+    manifest = {table['name']: table for table in json.loads(indexer.export_json_manifest())['tables']}
+    assert manifest['dbo.a']['indexed_fingerprint'] == 'fp-dbo.a'
+    assert manifest['dbo.b']['indexed_fingerprint'] is None
+    assert indexer.changed_tables == {'dbo.b'}
+
+
+def test_push_retries_only_the_failed_keys():
+    indexer = make_indexer(['dbo.a', 'dbo.b', 'dbo.c'])
+    search_client = FakeSearchClient(failures={'dbo__b': 1})
+
+    summary = indexer.push_to_ai_search(search_client=search_client, max_retries=3, retry_backoff=0, max_workers=1)
+
+    assert search_client.calls == [['dbo__a', 'dbo__b', 'dbo__c'], ['dbo__b']]
+    assert sorted(summary['succeeded']) == ['dbo__a', 'dbo__b', 'dbo__c']
+    assert summary['failed'] == {}
+
+
+def test_push_reports_keys_still_failing_after_the_last_retry():
+    indexer = make_indexer(['dbo.a', 'dbo.b'])
+    search_client = FakeSearchClient(failures={'dbo__a': 10})
+
+    summary = indexer.push_to_ai_search(search_client=search_client, max_retries=2, retry_backoff=0, max_workers=1)
+
+    assert search_client.calls == [['dbo__a', 'dbo__b'], ['dbo__a'], ['dbo__a']]
+    assert summary['succeeded'] == ['dbo__b']
+    assert summary['failed'] == {'dbo__a': '503: unavailable'}
+
+
+def test_push_retries_keys_missing_from_the_response():
+    indexer = make_indexer(['dbo.a', 'dbo.b'])
+    search_client = FakeSearchClient(missing={'dbo__b'})
+
+    summary = indexer.push_to_ai_search(search_client=search_client, max_retries=0, retry_backoff=0, max_workers=1)
+    assert summary['failed'] == {'dbo__b': 'No result returned for document'}
+
+    search_client = FakeSearchClient(missing={'dbo__b'})
+    summary = indexer.push_to_ai_search(search_client=search_client, only_changed=False, max_retries=1,
+                                        retry_backoff=0, max_workers=1)
+    assert search_client.calls == [['dbo__a', 'dbo__b'], ['dbo__b']]
+    assert sorted(summary['succeeded']) == ['dbo__a', 'dbo__b']
+
+
+def test_upload_batches_are_bounded_by_document_count_and_bytes():
+    documents = [{'name_key': f'k{i}', 'payload': 'x' * 100} for i in range(5)]
+    size = len(json.dumps(documents[0]).encode('utf-8'))
+
+    by_count = DatabaseIndexer._make_upload_batches(documents, max_batch_documents=2, max_batch_bytes=10 ** 6)
+    assert [len(batch) for batch in by_count] == [2, 2, 1]
+
+    by_bytes = DatabaseIndexer._make_upload_batches(documents, max_batch_documents=100, max_batch_bytes=size * 3)
+    assert [len(batch) for batch in by_bytes] == [3, 2]
+
+    # a document larger than the byte budget still goes out, alone in its batch
+    oversized = DatabaseIndexer._make_upload_batches(documents[:2], max_batch_documents=100, max_batch_bytes=size - 1)
+    assert [len(batch) for batch in oversized] == [1, 1]
+
+
+def test_push_splits_documents_into_batches():
+    indexer = make_indexer([f'dbo.t{i}' for i in range(5)])
+    search_client = FakeSearchClient()
+
+    summary = indexer.push_to_ai_search(search_client=search_client, max_batch_documents=2, retry_backoff=0, max_workers=1)
+
+    assert [len(keys) for keys in search_client.calls] == [2, 2, 1]
+    assert len(summary['succeeded']) == 5
@@ -0,0 +1,85 @@
+import pytest
+
+from sqltoolkit.connectors import SnowflakeConnector
+from sqltoolkit.pool import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, autocommit=False, rollback_fails=False):
+        self.autocommit = autocommit
+        self.rollback_fails = rollback_fails
+        self.rollbacks = 0
+        self.closed = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.rollback_fails:
+            raise RuntimeError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    def __init__(self, **options):
+        self.options = options
+        self.connections = []
+
+    def get_conn(self):
+        conn = FakeConnection(**self.options)
+        self.connections.append(conn)
+        return conn
+
+
+def test_release_rolls_back_connections_not_in_autocommit():
+    pool = ConnectionPool(FakeConnector(), min_size=0)
+
+    with pool.connection() as conn:
+        pass
+
+    assert conn.rollbacks == 1
+    with pool.connection() as reused:
+        assert reused is conn
+
+
+def test_release_skips_rollback_in_autocommit_mode():
+    pool = ConnectionPool(FakeConnector(autocommit=True), min_size=0)
+
+    with pool.connection() as conn:
+        pass
+
+    assert conn.rollbacks == 0
+
+
+def test_connection_that_cannot_be_rolled_back_is_discarded():
+    connector = FakeConnector(rollback_fails=True)
+    pool = ConnectionPool(connector, min_size=0)
+
+    with pool.connection() as conn:
+        pass
+
+    assert conn.closed
+    assert pool.size == 0
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError("query failed")
+    assert pool.size == 0
+
+
+def test_connector_reports_autocommit_mode():
+    class FakeSnowflakeConnector(SnowflakeConnector):
+        def get_conn(self):
+            # snowflake.connector connections expose autocommit as a method
+            conn = FakeConnection()
+            conn.autocommit = lambda mode: None
+            return conn
+
+    connector = FakeSnowflakeConnector('user', 'password', 'account', 'warehouse', 'database', 'schema')
+    with ConnectionPool(connector, min_size=0).connection() as conn:
+        pass
+    assert conn.rollbacks == 0
+
+    connector = FakeSnowflakeConnector('user', 'password', 'account', 'warehouse', 'database', 'schema', autocommit=False)
+    with ConnectionPool(connector, min_size=0).connection() as conn:
+        pass
+    assert conn.rollbacks == 1
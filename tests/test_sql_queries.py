@@ -0,0 +1,11 @@
+from sqltoolkit import sql_queries
+
+
+def test_sqlserver_column_values_keep_date_and_float_precision():
+    query = sql_queries.get_query('AZURE_SQL', 'get_table_column_values', table_name='dbo.t',
+                                  column_names=['created', 'amount', 'label'],
+                                  column_types={'created': 'datetime', 'amount': 'float', 'label': 'nvarchar'})
+
+    assert "CONVERT(NVARCHAR(4000), created, 121)" in query
+    assert "CONVERT(NVARCHAR(4000), amount, 3)" in query
+    assert "CAST(label AS NVARCHAR(4000))" in query